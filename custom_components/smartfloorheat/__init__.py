@@ -2,17 +2,20 @@
 
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import logging
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.start import async_at_started
 
 from .const import (
-    CONF_ROOMS,
+    DATA_ROOMS,
     DOMAIN,
+    MODE_AWAY,
     MODE_COMFORT,
     MODE_ECO,
     PLATFORMS,
@@ -20,23 +23,45 @@ from .const import (
     SERVICE_RESET_LEARNING,
     SERVICE_SET_MODE,
 )
-from .coordinator import SmartFloorHeatCoordinator
+from .controllers import RoomController
+from .coordinator import SmartFloorHeatCoordinator, compile_room_configs
+from .telemetry import telemetry_options
+
+_LOGGER = logging.getLogger(__name__)
+
+RoomRoute = tuple[SmartFloorHeatCoordinator, RoomController]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SmartFloorHeat from config entry."""
-    rooms = entry.data.get(CONF_ROOMS, [])
-    coordinator = SmartFloorHeatCoordinator(hass, rooms)
+    coordinator = SmartFloorHeatCoordinator(
+        hass, compile_room_configs(entry), entry.entry_id, dict(entry.options)
+    )
     await coordinator.async_setup()
     await coordinator.async_config_entry_first_refresh()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    _register_rooms(hass, entry, coordinator)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     await _async_register_services(hass)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    # Listeners, timers and switching wait for HA to finish booting so entity
+    # setup never blocks on actuator round-trips.
+    entry.async_on_unload(async_at_started(hass, coordinator.async_start))
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply options to the running coordinator without reloading the entry."""
+    coordinator: SmartFloorHeatCoordinator = hass.data[DOMAIN][entry.entry_id]
+    if telemetry_options(entry.options) != coordinator.telemetry_options:
+        # The exporter owns timers, files and an entity; rebuild the entry.
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    await coordinator.async_apply_room_configs(compile_room_configs(entry))
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     coordinator: SmartFloorHeatCoordinator = hass.data[DOMAIN][entry.entry_id]
     await coordinator.async_unload()
@@ -44,45 +69,74 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        _unregister_rooms(hass, coordinator)
     return ok
 
 
+def _register_rooms(hass: HomeAssistant, entry: ConfigEntry, coordinator: SmartFloorHeatCoordinator) -> None:
+    """Index rooms by id so services can route without scanning entries."""
+    registry: dict[str, RoomRoute] = hass.data.setdefault(DATA_ROOMS, {})
+    for room_id, ctrl in coordinator.controllers.items():
+        owner = registry.get(room_id)
+        if owner is not None and owner[0] is not coordinator:
+            _LOGGER.error(
+                "Room id '%s' in entry '%s' is already used by another entry; "
+                "services for this room will target the first one",
+                room_id,
+                entry.title,
+            )
+            continue
+        registry[room_id] = (coordinator, ctrl)
+
+
+def _unregister_rooms(hass: HomeAssistant, coordinator: SmartFloorHeatCoordinator) -> None:
+    """Drop a coordinator's rooms and hand colliding ids to the remaining entries."""
+    registry: dict[str, RoomRoute] = hass.data.get(DATA_ROOMS, {})
+    for room_id in [room_id for room_id, (owner, _) in registry.items() if owner is coordinator]:
+        del registry[room_id]
+    for other in hass.data.get(DOMAIN, {}).values():
+        for room_id, ctrl in other.controllers.items():
+            registry.setdefault(room_id, (other, ctrl))
+
+
 async def _async_register_services(hass: HomeAssistant) -> None:
     if hass.services.has_service(DOMAIN, SERVICE_RECALCULATE):
         return
 
-    async def _all_coordinators() -> list[SmartFloorHeatCoordinator]:
+    def _route(room: str) -> RoomRoute | None:
+        return hass.data.get(DATA_ROOMS, {}).get(room)
+
+    def _all_coordinators() -> list[SmartFloorHeatCoordinator]:
         return list(hass.data.get(DOMAIN, {}).values())
 
     async def handle_recalculate(call: ServiceCall) -> None:
         room = call.data.get("room")
-        for coordinator in await _all_coordinators():
-            if room:
-                await coordinator.async_recalculate_room(room)
-            else:
-                await coordinator.async_request_refresh()
+        if room:
+            if route := _route(room):
+                await route[0].async_recalculate_rooms([room])
+            return
+        await asyncio.gather(*(c.async_recalculate_rooms() for c in _all_coordinators()))
 
     async def handle_set_mode(call: ServiceCall) -> None:
         room = call.data["room"]
-        mode = call.data["mode"]
-        for coordinator in await _all_coordinators():
-            ctrl = coordinator.controllers.get(room)
-            if ctrl:
-                ctrl.async_set_mode(mode)
-                await coordinator.async_recalculate_room(room)
+        if route := _route(room):
+            coordinator, ctrl = route
+            ctrl.async_set_mode(call.data["mode"])
+            await coordinator.async_recalculate_rooms([room])
 
     async def handle_reset_learning(call: ServiceCall) -> None:
         room = call.data.get("room")
-        for coordinator in await _all_coordinators():
-            if room:
-                ctrl = coordinator.controllers.get(room)
-                if ctrl:
-                    ctrl.reset_learning()
-                    await coordinator.async_recalculate_room(room)
-            else:
-                for room_id, ctrl in coordinator.controllers.items():
-                    ctrl.reset_learning()
-                    await coordinator.async_recalculate_room(room_id)
+        if room:
+            if route := _route(room):
+                coordinator, ctrl = route
+                ctrl.reset_learning()
+                await coordinator.async_recalculate_rooms([room])
+            return
+        coordinators = _all_coordinators()
+        for coordinator in coordinators:
+            for ctrl in coordinator.controllers.values():
+                ctrl.reset_learning()
+        await asyncio.gather(*(c.async_recalculate_rooms() for c in coordinators))
 
     hass.services.async_register(
         DOMAIN,
@@ -96,7 +150,7 @@ async def _async_register_services(hass: HomeAssistant) -> None:
         handle_set_mode,
         schema=vol.Schema({
             vol.Required("room"): cv.string,
-            vol.Required("mode"): vol.In([MODE_ECO, MODE_COMFORT]),
+            vol.Required("mode"): vol.In([MODE_ECO, MODE_COMFORT, MODE_AWAY]),
         }),
     )
     hass.services.async_register(
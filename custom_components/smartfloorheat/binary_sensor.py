@@ -0,0 +1,44 @@
+"""Binary sensor entities for SmartFloorHeat."""
+
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import BinarySensorDeviceClass, BinarySensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import ATTR_WINDOW_OPEN_UNTIL, CONF_ROOM_NAME, DOMAIN
+from .coordinator import SmartFloorHeatCoordinator
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    coordinator: SmartFloorHeatCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        [SmartFloorHeatWindowOpenSensor(coordinator, room_id) for room_id in coordinator.controllers]
+    )
+
+
+class SmartFloorHeatWindowOpenSensor(CoordinatorEntity[SmartFloorHeatCoordinator], BinarySensorEntity):
+    """Open window detected for a room."""
+
+    _attr_device_class = BinarySensorDeviceClass.WINDOW
+
+    def __init__(self, coordinator: SmartFloorHeatCoordinator, room_id: str) -> None:
+        super().__init__(coordinator)
+        self.room_id = room_id
+        self.controller = coordinator.controllers[room_id]
+        self._attr_unique_id = f"smartfloorheat_{room_id}_window_open"
+        self._attr_name = f"SmartFloorHeat {self.controller.cfg[CONF_ROOM_NAME]} window_open"
+
+    @property
+    def is_on(self) -> bool:
+        return self.controller.window_open
+
+    @property
+    def extra_state_attributes(self):
+        return {ATTR_WINDOW_OPEN_UNTIL: self.controller.extra_attrs[ATTR_WINDOW_OPEN_UNTIL]}
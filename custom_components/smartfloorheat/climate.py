@@ -10,7 +10,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_HEATER_SWITCH, CONF_INDOOR_TEMP_SENSOR, CONF_ROOM_NAME, DOMAIN
+from .const import CONF_ROOM_NAME, DOMAIN
 from .coordinator import SmartFloorHeatCoordinator
 
 
@@ -21,8 +21,7 @@ async def async_setup_entry(
 ) -> None:
     coordinator: SmartFloorHeatCoordinator = hass.data[DOMAIN][entry.entry_id]
     async_add_entities(
-        [SmartFloorHeatClimate(coordinator, room_id) for room_id in coordinator.controllers],
-        update_before_add=True,
+        [SmartFloorHeatClimate(coordinator, room_id) for room_id in coordinator.controllers]
     )
 
 
@@ -41,7 +40,7 @@ class SmartFloorHeatClimate(CoordinatorEntity[SmartFloorHeatCoordinator], Climat
 
     @property
     def current_temperature(self) -> float | None:
-        return self.controller._f(self.controller.cfg[CONF_INDOOR_TEMP_SENSOR])
+        return self.controller.indoor_temp
 
     @property
     def target_temperature(self) -> float | None:
@@ -61,13 +60,7 @@ class SmartFloorHeatClimate(CoordinatorEntity[SmartFloorHeatCoordinator], Climat
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         if hvac_mode == HVACMode.OFF:
-            await self.hass.services.async_call(
-                "switch",
-                "turn_off",
-                {"entity_id": self.controller.cfg[CONF_HEATER_SWITCH]},
-                blocking=True,
-            )
-            self.controller.is_heating = False
+            await self.coordinator.async_switch_heaters(self.controller, False)
         elif hvac_mode in (HVACMode.HEAT, HVACMode.AUTO):
             await self.coordinator.async_recalculate_room(self.room_id)
         self.async_write_ha_state()
@@ -7,6 +7,7 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers import selector
 from homeassistant.util import slugify
 
@@ -14,22 +15,36 @@ from .const import (
     BASE_SOURCE_CLIMATE,
     BASE_SOURCE_NUMBER,
     BASE_SOURCE_VIRTUAL,
+    CONF_ADJACENT_ROOMS,
+    CONF_AWAY_SETBACK_C,
     CONF_BASE_CLIMATE_ENTITY,
     CONF_BASE_NUMBER_ENTITY,
     CONF_BASE_SOURCE_TYPE,
     CONF_BASE_VIRTUAL_TEMPERATURE,
     CONF_COMFORT_GUARD_DELTA,
+    CONF_ECO_SETBACK_C,
     CONF_ENABLE_FLOW_GUARD,
+    CONF_ENABLE_FORECAST,
     CONF_ENABLE_OUTDOOR,
     CONF_ENABLE_SOLAR,
     CONF_ENABLE_WIND,
+    CONF_ENABLE_WINDOW_DETECTION,
+    CONF_FLOOR_MAX_C,
+    CONF_FLOOR_MIN_C,
+    CONF_FLOOR_TEMP_SENSOR,
     CONF_FLOW_LOW_THRESHOLD,
     CONF_FLOW_TEMP_SENSOR,
+    CONF_HEATER_POWER_W,
     CONF_HEATER_SWITCH,
     CONF_HYSTERESIS_DEGC,
+    CONF_INDOOR_FUSION,
     CONF_INDOOR_TEMP_SENSOR,
+    CONF_INDOOR_WEIGHTS,
+    CONF_LONG_WINDOW_MINUTES,
+    CONF_MANIFOLD,
     CONF_MAX_COOLING_DEGC,
     CONF_MAX_OUTDOOR_BOOST_DEGC,
+    CONF_MAX_RATE_CPH,
     CONF_MAX_WIND_BOOST_DEGC,
     CONF_MIN_OFF_MINUTES,
     CONF_MIN_ON_MINUTES,
@@ -39,24 +54,300 @@ from .const import (
     CONF_OUTDOOR_BASE_C,
     CONF_OUTDOOR_NORM_C,
     CONF_OUTDOOR_TEMP_SENSOR,
+    CONF_OUTPUT_MODE,
+    CONF_PRESENCE_ENTITIES,
+    CONF_PWM_KI,
+    CONF_PWM_KP,
+    CONF_PWM_PERIOD_MINUTES,
     CONF_ROOM_ID,
     CONF_ROOM_NAME,
     CONF_ROOMS,
+    CONF_SCHEDULE,
+    CONF_SHORT_WINDOW_MINUTES,
     CONF_SOLAR_CURRENT_HOUR,
     CONF_SOLAR_NEXT_HOUR,
     CONF_SOLAR_NORM_KWH,
     CONF_SOLAR_TODAY_REMAINING,
     CONF_SOLAR_TOMORROW,
+    CONF_STALE_MINUTES,
     CONF_TAU_HOURS,
+    CONF_TELEMETRY_FORMAT,
+    CONF_TELEMETRY_MAX_MB,
+    CONF_TELEMETRY_TARGET,
+    CONF_TREND_WINDOW_MINUTES,
     CONF_UPDATE_INTERVAL_SECONDS,
     CONF_WIND_BASE_KMH,
     CONF_WIND_EFFECT_PERCENT,
     CONF_WIND_NORM_KMH,
+    CONF_WINDOW_CONTACT_SENSOR,
+    CONF_WINDOW_DETECT_MINUTES,
+    CONF_WINDOW_DROP_DEGC,
+    CONF_WINDOW_SUSPEND_MINUTES,
     CONF_WEATHER_ENTITY,
     DEFAULTS,
     DOMAIN,
+    FUSION_MEAN,
+    FUSION_MEDIAN,
+    FUSION_MIN,
+    NEW_ROOM_DEFAULTS,
     ORIENTATION_AZIMUTH,
+    OUTPUT_HYSTERESIS,
+    OUTPUT_PWM,
+    TELEMETRY_JSONL,
+    TELEMETRY_LINE_PROTOCOL,
+    TELEMETRY_OFF,
 )
+from .coordinator import compile_room_configs
+from .fusion import parse_weights
+from .schedule import WeeklySchedule
+
+
+def _required(key: str, values: dict[str, Any]) -> vol.Required:
+    if values.get(key) is not None:
+        return vol.Required(key, default=values[key])
+    return vol.Required(key)
+
+
+def _optional(key: str, values: dict[str, Any]) -> vol.Optional:
+    return vol.Optional(key, description={"suggested_value": values.get(key)})
+
+
+def _room_schema(
+    values: dict[str, Any], include_name: bool = True, other_rooms: list[str] | None = None
+) -> vol.Schema:
+    """Build the room form, prefilled from ``values``."""
+    fields: dict[Any, Any] = {}
+    if include_name:
+        fields[vol.Required(CONF_ROOM_NAME)] = selector.TextSelector()
+    fields.update(
+        {
+            _required(CONF_INDOOR_TEMP_SENSOR, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["sensor"], multiple=True)
+            ),
+            _required(CONF_INDOOR_FUSION, values): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[FUSION_MEAN, FUSION_MEDIAN, FUSION_MIN],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_INDOOR_FUSION,
+                )
+            ),
+            _optional(CONF_INDOOR_WEIGHTS, values): selector.TextSelector(),
+            _required(CONF_WEATHER_ENTITY, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["weather"])
+            ),
+            _optional(CONF_OUTDOOR_TEMP_SENSOR, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["sensor"])
+            ),
+            _optional(CONF_FLOW_TEMP_SENSOR, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["sensor"])
+            ),
+            _optional(CONF_FLOOR_TEMP_SENSOR, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["sensor"])
+            ),
+            _required(CONF_FLOOR_MAX_C, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=15.0, max=40.0, step=0.5)
+            ),
+            _required(CONF_FLOOR_MIN_C, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=25.0, step=0.5)
+            ),
+            vol.Required(
+                CONF_BASE_SOURCE_TYPE, default=values.get(CONF_BASE_SOURCE_TYPE, BASE_SOURCE_CLIMATE)
+            ): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[BASE_SOURCE_CLIMATE, BASE_SOURCE_NUMBER, BASE_SOURCE_VIRTUAL], mode=selector.SelectSelectorMode.DROPDOWN
+                )
+            ),
+            _optional(CONF_BASE_CLIMATE_ENTITY, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["climate"])
+            ),
+            _optional(CONF_BASE_NUMBER_ENTITY, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["number", "input_number"])
+            ),
+            vol.Optional(CONF_BASE_VIRTUAL_TEMPERATURE, default=values[CONF_BASE_VIRTUAL_TEMPERATURE]): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=5.0, max=35.0, step=0.5)
+            ),
+            _required(CONF_HEATER_SWITCH, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["switch"], multiple=True)
+            ),
+            _optional(CONF_MANIFOLD, values): selector.TextSelector(),
+            _optional(CONF_ADJACENT_ROOMS, values): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=other_rooms or [],
+                    multiple=True,
+                    custom_value=True,
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            _required(CONF_HEATER_POWER_W, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0, max=20000, step=10)
+            ),
+            _required(CONF_SOLAR_CURRENT_HOUR, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["sensor"])
+            ),
+            _required(CONF_SOLAR_NEXT_HOUR, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["sensor"])
+            ),
+            _required(CONF_SOLAR_TODAY_REMAINING, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["sensor"])
+            ),
+            _required(CONF_SOLAR_TOMORROW, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["sensor"])
+            ),
+            _required(CONF_ORIENTATION_MODE, values): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=["north", "south", "east", "west", "azimuth"],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                )
+            ),
+            _optional(CONF_ORIENTATION_DEGREES, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0, max=359, step=1)
+            ),
+            vol.Optional(CONF_ORIENTATION_FACTOR, default=values[CONF_ORIENTATION_FACTOR]): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=1.2, step=0.05)
+            ),
+            _required(CONF_WIND_EFFECT_PERCENT, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0, max=100, step=1)
+            ),
+            _required(CONF_MAX_COOLING_DEGC, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=3.0, step=0.05)
+            ),
+            _required(CONF_MAX_WIND_BOOST_DEGC, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=3.0, step=0.05)
+            ),
+            _required(CONF_MAX_OUTDOOR_BOOST_DEGC, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=3.0, step=0.05)
+            ),
+            _required(CONF_WIND_BASE_KMH, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=60.0, step=0.5)
+            ),
+            _required(CONF_WIND_NORM_KMH, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1.0, max=120.0, step=0.5)
+            ),
+            _required(CONF_OUTDOOR_BASE_C, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=-20.0, max=30.0, step=0.5)
+            ),
+            _required(CONF_OUTDOOR_NORM_C, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=-40.0, max=20.0, step=0.5)
+            ),
+            _required(CONF_SOLAR_NORM_KWH, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.1, max=20.0, step=0.1)
+            ),
+            _required(CONF_TAU_HOURS, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.1, max=12.0, step=0.1)
+            ),
+            _required(CONF_SHORT_WINDOW_MINUTES, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=2, max=60, step=1)
+            ),
+            _required(CONF_TREND_WINDOW_MINUTES, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=10, max=360, step=5)
+            ),
+            _required(CONF_LONG_WINDOW_MINUTES, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=60, max=1440, step=10)
+            ),
+            _required(CONF_COMFORT_GUARD_DELTA, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=2.0, step=0.05)
+            ),
+            _required(CONF_FLOW_LOW_THRESHOLD, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=10.0, max=50.0, step=0.1)
+            ),
+            _required(CONF_MIN_ON_MINUTES, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1, max=120, step=1)
+            ),
+            _required(CONF_MIN_OFF_MINUTES, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1, max=120, step=1)
+            ),
+            _required(CONF_HYSTERESIS_DEGC, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.05, max=2.0, step=0.05)
+            ),
+            _required(CONF_OUTPUT_MODE, values): selector.SelectSelector(
+                selector.SelectSelectorConfig(
+                    options=[OUTPUT_HYSTERESIS, OUTPUT_PWM],
+                    mode=selector.SelectSelectorMode.DROPDOWN,
+                    translation_key=CONF_OUTPUT_MODE,
+                )
+            ),
+            _required(CONF_PWM_PERIOD_MINUTES, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=5, max=180, step=5)
+            ),
+            _required(CONF_PWM_KP, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=5.0, step=0.05)
+            ),
+            _required(CONF_PWM_KI, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=5.0, step=0.05)
+            ),
+            _required(CONF_UPDATE_INTERVAL_SECONDS, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=30, max=3600, step=10)
+            ),
+            _optional(CONF_SCHEDULE, values): selector.TextSelector(
+                selector.TextSelectorConfig(multiline=True)
+            ),
+            _optional(CONF_PRESENCE_ENTITIES, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(
+                    domain=["binary_sensor", "person", "device_tracker", "input_boolean"], multiple=True
+                )
+            ),
+            _required(CONF_ECO_SETBACK_C, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=5.0, step=0.1)
+            ),
+            _required(CONF_AWAY_SETBACK_C, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.0, max=8.0, step=0.1)
+            ),
+            _optional(CONF_WINDOW_CONTACT_SENSOR, values): selector.EntitySelector(
+                selector.EntitySelectorConfig(domain=["binary_sensor"])
+            ),
+            _required(CONF_WINDOW_DETECT_MINUTES, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=1, max=30, step=1)
+            ),
+            _required(CONF_WINDOW_DROP_DEGC, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.1, max=5.0, step=0.1)
+            ),
+            _required(CONF_WINDOW_SUSPEND_MINUTES, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=5, max=240, step=5)
+            ),
+            _required(CONF_STALE_MINUTES, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=5, max=1440, step=5)
+            ),
+            _required(CONF_MAX_RATE_CPH, values): selector.NumberSelector(
+                selector.NumberSelectorConfig(min=0.5, max=30.0, step=0.5)
+            ),
+            _required(CONF_ENABLE_SOLAR, values): selector.BooleanSelector(),
+            _required(CONF_ENABLE_WIND, values): selector.BooleanSelector(),
+            _required(CONF_ENABLE_OUTDOOR, values): selector.BooleanSelector(),
+            _required(CONF_ENABLE_FLOW_GUARD, values): selector.BooleanSelector(),
+            _required(CONF_ENABLE_FORECAST, values): selector.BooleanSelector(),
+            _required(CONF_ENABLE_WINDOW_DETECTION, values): selector.BooleanSelector(),
+        }
+    )
+    return vol.Schema(fields)
+
+
+def _validate_room(user_input: dict[str, Any]) -> dict[str, str]:
+    errors: dict[str, str] = {}
+    try:
+        parse_weights(user_input.get(CONF_INDOOR_WEIGHTS))
+    except ValueError:
+        errors[CONF_INDOOR_WEIGHTS] = "invalid_weights"
+    try:
+        WeeklySchedule.parse(user_input.get(CONF_SCHEDULE))
+    except ValueError:
+        errors[CONF_SCHEDULE] = "invalid_schedule"
+    return errors
+
+
+def _clean_room(user_input: dict[str, Any]) -> dict[str, Any]:
+    room = dict(user_input)
+    if room[CONF_BASE_SOURCE_TYPE] == BASE_SOURCE_CLIMATE:
+        room.pop(CONF_BASE_NUMBER_ENTITY, None)
+        room.pop(CONF_BASE_VIRTUAL_TEMPERATURE, None)
+    elif room[CONF_BASE_SOURCE_TYPE] == BASE_SOURCE_NUMBER:
+        room.pop(CONF_BASE_CLIMATE_ENTITY, None)
+        room.pop(CONF_BASE_VIRTUAL_TEMPERATURE, None)
+    else:
+        room.pop(CONF_BASE_CLIMATE_ENTITY, None)
+        room.pop(CONF_BASE_NUMBER_ENTITY, None)
+    if room[CONF_ORIENTATION_MODE] != ORIENTATION_AZIMUTH:
+        room.pop(CONF_ORIENTATION_DEGREES, None)
+    return room
 
 
 class SmartFloorHeatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -67,6 +358,11 @@ class SmartFloorHeatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         self._rooms: list[dict[str, Any]] = []
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> SmartFloorHeatOptionsFlow:
+        return SmartFloorHeatOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: dict[str, Any] | None = None):
         if user_input is not None:
             return await self.async_step_room()
@@ -75,136 +371,21 @@ class SmartFloorHeatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_room(self, user_input: dict[str, Any] | None = None):
         errors: dict[str, str] = {}
         if user_input is not None:
-            room = dict(user_input)
-            room[CONF_ROOM_ID] = slugify(room[CONF_ROOM_NAME])
-            if room[CONF_BASE_SOURCE_TYPE] == BASE_SOURCE_CLIMATE:
-                room.pop(CONF_BASE_NUMBER_ENTITY, None)
-                room.pop(CONF_BASE_VIRTUAL_TEMPERATURE, None)
-            elif room[CONF_BASE_SOURCE_TYPE] == BASE_SOURCE_NUMBER:
-                room.pop(CONF_BASE_CLIMATE_ENTITY, None)
-                room.pop(CONF_BASE_VIRTUAL_TEMPERATURE, None)
-            else:
-                room.pop(CONF_BASE_CLIMATE_ENTITY, None)
-                room.pop(CONF_BASE_NUMBER_ENTITY, None)
-            if room[CONF_ORIENTATION_MODE] != ORIENTATION_AZIMUTH:
-                room.pop(CONF_ORIENTATION_DEGREES, None)
-            self._rooms.append(room)
-            return await self.async_step_add_another()
-
-        schema = vol.Schema(
-            {
-                vol.Required(CONF_ROOM_NAME): selector.TextSelector(),
-                vol.Required(CONF_INDOOR_TEMP_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor"])
-                ),
-                vol.Required(CONF_WEATHER_ENTITY): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["weather"])
-                ),
-                vol.Optional(CONF_OUTDOOR_TEMP_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor"])
-                ),
-                vol.Optional(CONF_FLOW_TEMP_SENSOR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor"])
-                ),
-                vol.Required(
-                    CONF_BASE_SOURCE_TYPE, default=BASE_SOURCE_CLIMATE
-                ): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=[BASE_SOURCE_CLIMATE, BASE_SOURCE_NUMBER, BASE_SOURCE_VIRTUAL], mode=selector.SelectSelectorMode.DROPDOWN
-                    )
-                ),
-                vol.Optional(CONF_BASE_CLIMATE_ENTITY): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["climate"])
-                ),
-                vol.Optional(CONF_BASE_NUMBER_ENTITY): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["number", "input_number"])
-                ),
-                vol.Optional(CONF_BASE_VIRTUAL_TEMPERATURE, default=DEFAULTS[CONF_BASE_VIRTUAL_TEMPERATURE]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=5.0, max=35.0, step=0.5)
-                ),
-                vol.Required(CONF_HEATER_SWITCH): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["switch"])
-                ),
-                vol.Required(CONF_SOLAR_CURRENT_HOUR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor"])
-                ),
-                vol.Required(CONF_SOLAR_NEXT_HOUR): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor"])
-                ),
-                vol.Required(CONF_SOLAR_TODAY_REMAINING): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor"])
-                ),
-                vol.Required(CONF_SOLAR_TOMORROW): selector.EntitySelector(
-                    selector.EntitySelectorConfig(domain=["sensor"])
-                ),
-                vol.Required(CONF_ORIENTATION_MODE, default=DEFAULTS[CONF_ORIENTATION_MODE]): selector.SelectSelector(
-                    selector.SelectSelectorConfig(
-                        options=["north", "south", "east", "west", "azimuth"],
-                        mode=selector.SelectSelectorMode.DROPDOWN,
-                    )
-                ),
-                vol.Optional(CONF_ORIENTATION_DEGREES): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0, max=359, step=1)
-                ),
-                vol.Optional(CONF_ORIENTATION_FACTOR, default=DEFAULTS[CONF_ORIENTATION_FACTOR]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0.0, max=1.2, step=0.05)
-                ),
-                vol.Required(CONF_WIND_EFFECT_PERCENT, default=DEFAULTS[CONF_WIND_EFFECT_PERCENT]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0, max=100, step=1)
-                ),
-                vol.Required(CONF_MAX_COOLING_DEGC, default=DEFAULTS[CONF_MAX_COOLING_DEGC]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0.0, max=3.0, step=0.05)
-                ),
-                vol.Required(CONF_MAX_WIND_BOOST_DEGC, default=DEFAULTS[CONF_MAX_WIND_BOOST_DEGC]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0.0, max=3.0, step=0.05)
-                ),
-                vol.Required(CONF_MAX_OUTDOOR_BOOST_DEGC, default=DEFAULTS[CONF_MAX_OUTDOOR_BOOST_DEGC]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0.0, max=3.0, step=0.05)
-                ),
-                vol.Required(CONF_WIND_BASE_KMH, default=DEFAULTS[CONF_WIND_BASE_KMH]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0.0, max=60.0, step=0.5)
-                ),
-                vol.Required(CONF_WIND_NORM_KMH, default=DEFAULTS[CONF_WIND_NORM_KMH]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=1.0, max=120.0, step=0.5)
-                ),
-                vol.Required(CONF_OUTDOOR_BASE_C, default=DEFAULTS[CONF_OUTDOOR_BASE_C]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=-20.0, max=30.0, step=0.5)
-                ),
-                vol.Required(CONF_OUTDOOR_NORM_C, default=DEFAULTS[CONF_OUTDOOR_NORM_C]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=-40.0, max=20.0, step=0.5)
-                ),
-                vol.Required(CONF_SOLAR_NORM_KWH, default=DEFAULTS[CONF_SOLAR_NORM_KWH]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0.1, max=20.0, step=0.1)
-                ),
-                vol.Required(CONF_TAU_HOURS, default=DEFAULTS[CONF_TAU_HOURS]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0.1, max=12.0, step=0.1)
-                ),
-                vol.Required(CONF_COMFORT_GUARD_DELTA, default=DEFAULTS[CONF_COMFORT_GUARD_DELTA]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0.0, max=2.0, step=0.05)
-                ),
-                vol.Required(CONF_FLOW_LOW_THRESHOLD, default=DEFAULTS[CONF_FLOW_LOW_THRESHOLD]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=10.0, max=50.0, step=0.1)
-                ),
-                vol.Required(CONF_MIN_ON_MINUTES, default=DEFAULTS[CONF_MIN_ON_MINUTES]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=1, max=120, step=1)
-                ),
-                vol.Required(CONF_MIN_OFF_MINUTES, default=DEFAULTS[CONF_MIN_OFF_MINUTES]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=1, max=120, step=1)
-                ),
-                vol.Required(CONF_HYSTERESIS_DEGC, default=DEFAULTS[CONF_HYSTERESIS_DEGC]): selector.NumberSelector(
-                    selector.NumberSelectorConfig(min=0.05, max=2.0, step=0.05)
-                ),
-                vol.Required(
-                    CONF_UPDATE_INTERVAL_SECONDS,
-                    default=DEFAULTS[CONF_UPDATE_INTERVAL_SECONDS],
-                ): selector.NumberSelector(selector.NumberSelectorConfig(min=30, max=3600, step=10)),
-                vol.Required(CONF_ENABLE_SOLAR, default=DEFAULTS[CONF_ENABLE_SOLAR]): selector.BooleanSelector(),
-                vol.Required(CONF_ENABLE_WIND, default=DEFAULTS[CONF_ENABLE_WIND]): selector.BooleanSelector(),
-                vol.Required(CONF_ENABLE_OUTDOOR, default=DEFAULTS[CONF_ENABLE_OUTDOOR]): selector.BooleanSelector(),
-                vol.Required(CONF_ENABLE_FLOW_GUARD, default=DEFAULTS[CONF_ENABLE_FLOW_GUARD]): selector.BooleanSelector(),
-            }
+            errors = _validate_room(user_input)
+            if not errors:
+                room = _clean_room(user_input)
+                room[CONF_ROOM_ID] = slugify(room[CONF_ROOM_NAME])
+                self._rooms.append(room)
+                return await self.async_step_add_another()
+
+        return self.async_show_form(
+            step_id="room",
+            data_schema=_room_schema(
+                {**DEFAULTS, **NEW_ROOM_DEFAULTS, **(user_input or {})},
+                other_rooms=[room[CONF_ROOM_ID] for room in self._rooms],
+            ),
+            errors=errors,
         )
-        return self.async_show_form(step_id="room", data_schema=schema, errors=errors)
 
     async def async_step_add_another(self, user_input: dict[str, Any] | None = None):
         if user_input is not None:
@@ -227,3 +408,87 @@ class SmartFloorHeatConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             ),
             description_placeholders={"rooms": str(len(self._rooms))},
         )
+
+
+class SmartFloorHeatOptionsFlow(config_entries.OptionsFlow):
+    """Edit per-room tuning of an existing entry."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        self._entry = config_entry
+        self._room_id: str | None = None
+
+    async def async_step_init(self, user_input: dict[str, Any] | None = None):
+        return self.async_show_menu(step_id="init", menu_options=["select_room", "telemetry"])
+
+    async def async_step_select_room(self, user_input: dict[str, Any] | None = None):
+        rooms = {room[CONF_ROOM_ID]: room[CONF_ROOM_NAME] for room in compile_room_configs(self._entry)}
+        if user_input is not None:
+            self._room_id = user_input[CONF_ROOM_ID]
+            return await self.async_step_room()
+
+        return self.async_show_form(
+            step_id="select_room",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_ROOM_ID): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[
+                                selector.SelectOptionDict(value=room_id, label=name)
+                                for room_id, name in rooms.items()
+                            ],
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                        )
+                    )
+                }
+            ),
+        )
+
+    async def async_step_room(self, user_input: dict[str, Any] | None = None):
+        rooms = compile_room_configs(self._entry)
+        current = next(room for room in rooms if room[CONF_ROOM_ID] == self._room_id)
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            errors = _validate_room(user_input)
+            if not errors:
+                room = _clean_room(user_input)
+                room[CONF_ROOM_NAME] = current[CONF_ROOM_NAME]
+                room[CONF_ROOM_ID] = self._room_id
+                overrides = dict(self._entry.options.get(CONF_ROOMS, {}))
+                overrides[self._room_id] = room
+                return self.async_create_entry(title="", data={**self._entry.options, CONF_ROOMS: overrides})
+
+        return self.async_show_form(
+            step_id="room",
+            data_schema=_room_schema(
+                {**current, **(user_input or {})},
+                include_name=False,
+                other_rooms=[room[CONF_ROOM_ID] for room in rooms if room[CONF_ROOM_ID] != self._room_id],
+            ),
+            errors=errors,
+            description_placeholders={"room": current[CONF_ROOM_NAME]},
+        )
+
+    async def async_step_telemetry(self, user_input: dict[str, Any] | None = None):
+        if user_input is not None:
+            options = {k: v for k, v in self._entry.options.items() if k != CONF_TELEMETRY_TARGET}
+            return self.async_create_entry(title="", data={**options, **user_input})
+
+        values = {CONF_TELEMETRY_FORMAT: TELEMETRY_OFF, CONF_TELEMETRY_MAX_MB: 10, **self._entry.options}
+        return self.async_show_form(
+            step_id="telemetry",
+            data_schema=vol.Schema(
+                {
+                    _required(CONF_TELEMETRY_FORMAT, values): selector.SelectSelector(
+                        selector.SelectSelectorConfig(
+                            options=[TELEMETRY_OFF, TELEMETRY_JSONL, TELEMETRY_LINE_PROTOCOL],
+                            mode=selector.SelectSelectorMode.DROPDOWN,
+                            translation_key=CONF_TELEMETRY_FORMAT,
+                        )
+                    ),
+                    _optional(CONF_TELEMETRY_TARGET, values): selector.TextSelector(),
+                    _required(CONF_TELEMETRY_MAX_MB, values): selector.NumberSelector(
+                        selector.NumberSelectorConfig(min=1, max=1000, step=1)
+                    ),
+                }
+            ),
+        )
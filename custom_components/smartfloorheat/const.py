@@ -3,16 +3,28 @@
 from __future__ import annotations
 
 DOMAIN = "smartfloorheat"
-PLATFORMS = ["climate", "sensor"]
+DATA_ROOMS = f"{DOMAIN}_rooms"
+PLATFORMS = ["binary_sensor", "climate", "sensor"]
 
 CONF_ROOMS = "rooms"
 CONF_ROOM_NAME = "room_name"
 CONF_ROOM_ID = "room_id"
 CONF_INDOOR_TEMP_SENSOR = "indoor_temp_sensor"
+CONF_INDOOR_FUSION = "indoor_fusion"
+FUSION_MEAN = "mean"
+FUSION_MEDIAN = "median"
+FUSION_MIN = "min"
+CONF_INDOOR_WEIGHTS = "indoor_weights"
 CONF_WEATHER_ENTITY = "weather_entity"
 CONF_OUTDOOR_TEMP_SENSOR = "outdoor_temp_sensor"
 CONF_FLOW_TEMP_SENSOR = "flow_temp_sensor"
+CONF_FLOOR_TEMP_SENSOR = "floor_temp_sensor"
+CONF_FLOOR_MAX_C = "floor_max_c"
+CONF_FLOOR_MIN_C = "floor_min_c"
 CONF_HEATER_SWITCH = "heater_switch"
+CONF_MANIFOLD = "manifold"
+CONF_ADJACENT_ROOMS = "adjacent_rooms"
+CONF_HEATER_POWER_W = "heater_power_w"
 
 CONF_BASE_SOURCE_TYPE = "base_source_type"
 BASE_SOURCE_CLIMATE = "climate"
@@ -46,34 +58,89 @@ CONF_OUTDOOR_BASE_C = "outdoor_base_c"
 CONF_OUTDOOR_NORM_C = "outdoor_norm_c"
 CONF_SOLAR_NORM_KWH = "solar_norm_kwh"
 CONF_TAU_HOURS = "tau_hours"
+CONF_SHORT_WINDOW_MINUTES = "short_window_minutes"
+CONF_TREND_WINDOW_MINUTES = "trend_window_minutes"
+CONF_LONG_WINDOW_MINUTES = "long_window_minutes"
 CONF_COMFORT_GUARD_DELTA = "comfort_guard_delta"
 CONF_FLOW_LOW_THRESHOLD = "flow_low_threshold"
 CONF_MIN_ON_MINUTES = "min_on_minutes"
 CONF_MIN_OFF_MINUTES = "min_off_minutes"
 CONF_HYSTERESIS_DEGC = "hysteresis_degC"
+CONF_OUTPUT_MODE = "output_mode"
+OUTPUT_HYSTERESIS = "hysteresis"
+OUTPUT_PWM = "pwm"
+CONF_PWM_PERIOD_MINUTES = "pwm_period_minutes"
+CONF_PWM_KP = "pwm_kp"
+CONF_PWM_KI = "pwm_ki"
 CONF_UPDATE_INTERVAL_SECONDS = "update_interval_seconds"
+CONF_TELEMETRY_FORMAT = "telemetry_format"
+TELEMETRY_OFF = "off"
+TELEMETRY_JSONL = "jsonl"
+TELEMETRY_LINE_PROTOCOL = "line_protocol"
+CONF_TELEMETRY_TARGET = "telemetry_target"
+CONF_TELEMETRY_MAX_MB = "telemetry_max_mb"
+CONF_SCHEDULE = "schedule"
+CONF_WINDOW_CONTACT_SENSOR = "window_contact_sensor"
+CONF_WINDOW_DETECT_MINUTES = "window_detect_minutes"
+CONF_WINDOW_DROP_DEGC = "window_drop_degC"
+CONF_WINDOW_SUSPEND_MINUTES = "window_suspend_minutes"
+CONF_PRESENCE_ENTITIES = "presence_entities"
+CONF_ECO_SETBACK_C = "eco_setback_c"
+CONF_AWAY_SETBACK_C = "away_setback_c"
+CONF_STALE_MINUTES = "stale_minutes"
+CONF_MAX_RATE_CPH = "max_rate_cph"
 
 CONF_ENABLE_SOLAR = "enable_solar_correction"
 CONF_ENABLE_WIND = "enable_wind_correction"
 CONF_ENABLE_OUTDOOR = "enable_outdoor_correction"
 CONF_ENABLE_FLOW_GUARD = "enable_flow_guard"
+CONF_ENABLE_FORECAST = "enable_forecast"
+CONF_ENABLE_WINDOW_DETECTION = "enable_window_detection"
 
 ATTR_BASE_SETPOINT = "base_setpoint"
 ATTR_FINAL_SETPOINT = "final_setpoint"
 ATTR_EFFECTIVE_TARGET = "effective_target"
 ATTR_OFFSETS = "offsets"
 ATTR_TREND_CPH = "trend_cph"
+ATTR_TRENDS_CPH = "trends_cph"
 ATTR_OUTDOOR_DROP_GAIN = "outdoor_drop_gain"
 ATTR_LAST_SWITCH_CHANGE_TS = "last_switch_change_ts"
+ATTR_REJECTED_SAMPLES = "rejected_samples"
+ATTR_FLOOR_TEMP = "floor_temp"
+ATTR_MODE = "mode"
+ATTR_DUTY_CYCLE = "duty_cycle"
+ATTR_PWM_PHASE = "pwm_phase"
+ATTR_RECALC_MEMO = "recalc_memo"
+ATTR_THERMAL_MODEL = "thermal_model"
+ATTR_WINDOW_OPEN_UNTIL = "window_open_until"
+ATTR_NEXT_TRANSITION = "next_transition"
+ATTR_HEATING_RATE_CPH = "heating_rate_cph"
+ATTR_FLOOR_LIMIT = "floor_limit"
+ATTR_INDOOR_STALE = "indoor_stale"
+
+FLOOR_LIMIT_MAX = "max"
+FLOOR_LIMIT_MIN = "min"
+
+ENERGY_STORAGE_VERSION = 1
+ENERGY_SAVE_DELAY_SECONDS = 30
 
 SERVICE_RECALCULATE = "recalculate"
 SERVICE_SET_MODE = "set_mode"
 SERVICE_RESET_LEARNING = "reset_learning"
 
+HORIZON_SHORT = "short"
+HORIZON_TREND = "trend"
+HORIZON_LONG = "long"
+HORIZON_WINDOW = "window"
+
 MODE_COMFORT = "comfort"
 MODE_ECO = "eco"
+MODE_AWAY = "away"
+
+PRESENT_STATES = ("on", "home")
 
 DEFAULTS = {
+    CONF_INDOOR_FUSION: FUSION_MEAN,
     CONF_ORIENTATION_MODE: ORIENTATION_SOUTH,
     CONF_ORIENTATION_FACTOR: 1.0,
     CONF_WIND_EFFECT_PERCENT: 100,
@@ -86,25 +153,55 @@ DEFAULTS = {
     CONF_OUTDOOR_NORM_C: -5.0,
     CONF_SOLAR_NORM_KWH: 2.5,
     CONF_TAU_HOURS: 3.5,
+    CONF_SHORT_WINDOW_MINUTES: 10,
+    CONF_TREND_WINDOW_MINUTES: 60,
+    CONF_LONG_WINDOW_MINUTES: 360,
     CONF_COMFORT_GUARD_DELTA: 0.2,
     CONF_FLOW_LOW_THRESHOLD: 29.0,
+    CONF_HEATER_POWER_W: 0.0,
+    CONF_FLOOR_MAX_C: 27.0,
+    CONF_FLOOR_MIN_C: 5.0,
     CONF_MIN_ON_MINUTES: 8,
     CONF_MIN_OFF_MINUTES: 8,
     CONF_HYSTERESIS_DEGC: 0.2,
+    CONF_OUTPUT_MODE: OUTPUT_HYSTERESIS,
+    CONF_PWM_PERIOD_MINUTES: 30,
+    CONF_PWM_KP: 0.5,
+    CONF_PWM_KI: 0.2,
     CONF_UPDATE_INTERVAL_SECONDS: 600,
+    CONF_STALE_MINUTES: 120,
+    CONF_ECO_SETBACK_C: 0.0,
+    CONF_AWAY_SETBACK_C: 2.0,
+    CONF_MAX_RATE_CPH: 6.0,
     CONF_ENABLE_SOLAR: True,
     CONF_ENABLE_WIND: True,
     CONF_ENABLE_OUTDOOR: True,
     CONF_ENABLE_FLOW_GUARD: True,
+    CONF_ENABLE_FORECAST: False,
+    CONF_ENABLE_WINDOW_DETECTION: False,
+    CONF_WINDOW_DETECT_MINUTES: 5,
+    CONF_WINDOW_DROP_DEGC: 0.6,
+    CONF_WINDOW_SUSPEND_MINUTES: 30,
     CONF_BASE_VIRTUAL_TEMPERATURE: 21.0,
 }
 
+# Behaviour-changing features stay off for rooms stored before they existed,
+# but are suggested for rooms created in the config flow.
+NEW_ROOM_DEFAULTS = {
+    CONF_ENABLE_FORECAST: True,
+    CONF_ENABLE_WINDOW_DETECTION: True,
+}
+
 DEBUG_KEYS = (
     "base_setpoint",
+    "mode",
+    "setback",
     "indoor_temp",
     "outdoor_temp",
     "wind_speed",
     "wind_gust_speed",
+    "forecast_wind",
+    "forecast_outdoor",
     "solar_impulse",
     "solar_score",
     "wind_score",
@@ -122,4 +219,8 @@ DEBUG_KEYS = (
     "trend_cph",
     "outdoor_drop_gain",
     "heating_request",
+    "duty_cycle",
+    "predicted_change",
+    "window_open",
+    "indoor_stale",
 )
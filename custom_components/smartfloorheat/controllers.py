@@ -2,44 +2,69 @@
 
 from __future__ import annotations
 
-from collections import deque
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import json
-from typing import Any
+from typing import Any, Callable
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers.event import async_track_point_in_time, async_track_state_change_event
 from homeassistant.util import slugify
-from homeassistant.util.dt import utcnow
+from homeassistant.util.dt import as_local, utcnow
 
 from .const import (
     ATTR_BASE_SETPOINT,
+    ATTR_DUTY_CYCLE,
     ATTR_EFFECTIVE_TARGET,
     ATTR_FINAL_SETPOINT,
+    ATTR_FLOOR_LIMIT,
+    ATTR_FLOOR_TEMP,
+    ATTR_HEATING_RATE_CPH,
+    ATTR_INDOOR_STALE,
     ATTR_LAST_SWITCH_CHANGE_TS,
+    ATTR_MODE,
+    ATTR_NEXT_TRANSITION,
     ATTR_OFFSETS,
     ATTR_OUTDOOR_DROP_GAIN,
+    ATTR_PWM_PHASE,
+    ATTR_RECALC_MEMO,
+    ATTR_THERMAL_MODEL,
+    ATTR_REJECTED_SAMPLES,
     ATTR_TREND_CPH,
+    ATTR_TRENDS_CPH,
+    ATTR_WINDOW_OPEN_UNTIL,
     BASE_SOURCE_CLIMATE,
     BASE_SOURCE_NUMBER,
     BASE_SOURCE_VIRTUAL,
+    CONF_AWAY_SETBACK_C,
     CONF_BASE_CLIMATE_ENTITY,
     CONF_BASE_NUMBER_ENTITY,
     CONF_BASE_SOURCE_TYPE,
     CONF_BASE_VIRTUAL_TEMPERATURE,
     CONF_COMFORT_GUARD_DELTA,
+    CONF_ECO_SETBACK_C,
     CONF_ENABLE_FLOW_GUARD,
+    CONF_ENABLE_FORECAST,
     CONF_ENABLE_OUTDOOR,
     CONF_ENABLE_SOLAR,
     CONF_ENABLE_WIND,
+    CONF_ENABLE_WINDOW_DETECTION,
+    CONF_FLOOR_MAX_C,
+    CONF_FLOOR_MIN_C,
+    CONF_FLOOR_TEMP_SENSOR,
     CONF_FLOW_LOW_THRESHOLD,
     CONF_FLOW_TEMP_SENSOR,
+    CONF_HEATER_POWER_W,
     CONF_HEATER_SWITCH,
     CONF_HYSTERESIS_DEGC,
+    CONF_INDOOR_FUSION,
     CONF_INDOOR_TEMP_SENSOR,
+    CONF_INDOOR_WEIGHTS,
+    CONF_LONG_WINDOW_MINUTES,
+    CONF_MANIFOLD,
     CONF_MAX_COOLING_DEGC,
     CONF_MAX_OUTDOOR_BOOST_DEGC,
+    CONF_MAX_RATE_CPH,
     CONF_MAX_WIND_BOOST_DEGC,
     CONF_MIN_OFF_MINUTES,
     CONF_MIN_ON_MINUTES,
@@ -48,25 +73,72 @@ from .const import (
     CONF_OUTDOOR_BASE_C,
     CONF_OUTDOOR_NORM_C,
     CONF_OUTDOOR_TEMP_SENSOR,
+    CONF_OUTPUT_MODE,
+    CONF_PRESENCE_ENTITIES,
+    CONF_PWM_KI,
+    CONF_PWM_KP,
+    CONF_PWM_PERIOD_MINUTES,
     CONF_ROOM_ID,
     CONF_ROOM_NAME,
+    CONF_SCHEDULE,
+    CONF_SHORT_WINDOW_MINUTES,
     CONF_SOLAR_CURRENT_HOUR,
     CONF_SOLAR_NEXT_HOUR,
     CONF_SOLAR_NORM_KWH,
     CONF_SOLAR_TODAY_REMAINING,
     CONF_SOLAR_TOMORROW,
+    CONF_STALE_MINUTES,
+    CONF_TAU_HOURS,
+    CONF_TREND_WINDOW_MINUTES,
     CONF_WIND_BASE_KMH,
     CONF_WIND_EFFECT_PERCENT,
     CONF_WIND_NORM_KMH,
+    CONF_WINDOW_CONTACT_SENSOR,
+    CONF_WINDOW_DETECT_MINUTES,
+    CONF_WINDOW_DROP_DEGC,
+    CONF_WINDOW_SUSPEND_MINUTES,
     CONF_WEATHER_ENTITY,
     DEBUG_KEYS,
+    FLOOR_LIMIT_MAX,
+    FLOOR_LIMIT_MIN,
+    HORIZON_LONG,
+    HORIZON_SHORT,
+    HORIZON_TREND,
+    HORIZON_WINDOW,
+    MODE_AWAY,
     MODE_COMFORT,
     MODE_ECO,
     ORIENTATION_EAST,
     ORIENTATION_NORTH,
     ORIENTATION_SOUTH,
     ORIENTATION_WEST,
+    OUTPUT_PWM,
+    PRESENT_STATES,
 )
+from .energy import EnergyMeter
+from .filters import SampleFilter
+from .forecast import weighted_lookahead
+from .fusion import SensorFusion, parse_weights
+from .pwm import PIController
+from .samples import SampleWindow
+from .schedule import WeeklySchedule
+
+PREHEAT_DEFAULT_RATE_CPH = 1.0
+PREHEAT_MIN_RATE_CPH = 0.2
+PREHEAT_MAX_HOURS = 6.0
+# A floor limit holds until the floor is this far back inside the band.
+FLOOR_LIMIT_MARGIN_DEGC = 0.5
+
+# Input resolution for the recalculation fingerprint, roughly sensor precision.
+FINGERPRINT_TEMP_STEP = 0.05
+FINGERPRINT_WIND_STEP = 0.5
+FINGERPRINT_SOLAR_STEP = 0.01
+FINGERPRINT_TREND_STEP = 0.01
+FINGERPRINT_GAIN_STEP = 0.001
+
+
+def _quantise(value: float | None, step: float) -> int | None:
+    return None if value is None else round(value / step)
 
 
 @dataclass
@@ -83,42 +155,87 @@ class Offsets:
 class RoomController:
     """Controller for one room."""
 
-    def __init__(self, hass: HomeAssistant, cfg: dict[str, Any], request_callback) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        cfg: dict[str, Any],
+        request_callback,
+        switch_callback,
+        forecast_callback,
+        update_callback: Callable[[], None] | None = None,
+    ) -> None:
         self.hass = hass
-        self.cfg = cfg
+        self._source_cfg = dict(cfg)
+        self.cfg = dict(cfg)
         self.request_callback = request_callback
+        self.switch_callback = switch_callback
+        self.forecast_callback = forecast_callback
+        self.update_callback = update_callback
 
         self.room_name = cfg[CONF_ROOM_NAME]
         self.room_id = cfg.get(CONF_ROOM_ID) or slugify(self.room_name)
 
-        self.indoor_samples: deque[tuple[datetime, float]] = deque()
-        self.outdoor_samples: deque[tuple[datetime, float]] = deque()
+        self.indoor_samples = SampleWindow(self._indoor_horizons())
+        self.outdoor_samples = SampleWindow(self._outdoor_horizons())
+        self.window_open_until: datetime | None = None
+        self._unsub_window: Callable[[], None] | None = None
+        self.indoor_fusion = self._build_fusion()
+        self.indoor_filter = SampleFilter()
+        self.outdoor_filter = SampleFilter()
 
         self.last_setpoint_sent: float | None = None
         self.last_switch_change_ts: datetime | None = None
         self.is_heating = False
+        # Switch requested from the coordinator but not yet confirmed by it.
+        self._switch_pending: bool | None = None
+        self.heat_request = False
+        self.floor_limit: str | None = None
+        self.energy = EnergyMeter()
+        self.pi = PIController()
+        self.duty_cycle = 0.0
+        self._pwm_on = False
+        self.pwm_phase = 0.0
+        # Start of the next PWM period, fixed when the current one began.
+        self._pwm_next_start: datetime | None = None
+        self.outdoor_temp: float | None = None
+        self.indoor_stale = False
+        # Set by the coordinator's building model when rooms are coupled.
+        self.predicted_change: float | None = None
+        self.thermal_params: dict[str, Any] | None = None
+        self._unsub_pwm: list[Callable[[], None]] = []
         self.computed_final_setpoint: float = 20.0
         self.current_offsets = {"solar": 0.0, "wind": 0.0, "outdoor": 0.0, "total": 0.0}
         self.trend_cph = 0.0
         self.outdoor_drop_gain = 1.0
         self.base_setpoint = 20.0
         self.mode = MODE_COMFORT
-        self._comfort_tuning = {
+        self._tuned_mode = MODE_COMFORT
+        self._comfort_tuning = self._tuning_from(cfg)
+        self.schedule = WeeklySchedule.parse(cfg.get(CONF_SCHEDULE))
+        self.heating_rate_cph: float | None = None
+        self._next_transition: tuple[datetime, str] | None = None
+        self._unsub_transition: Callable[[], None] | None = None
+        self.debug = {k: None for k in DEBUG_KEYS}
+        self._fingerprint: tuple | None = None
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+        self._unsubs: dict[str, Callable[[], None]] = {}
+
+    @staticmethod
+    def _tuning_from(cfg: dict[str, Any]) -> dict[str, float]:
+        return {
             CONF_MAX_COOLING_DEGC: cfg[CONF_MAX_COOLING_DEGC],
             CONF_MAX_WIND_BOOST_DEGC: cfg[CONF_MAX_WIND_BOOST_DEGC],
             CONF_MAX_OUTDOOR_BOOST_DEGC: cfg[CONF_MAX_OUTDOOR_BOOST_DEGC],
             CONF_COMFORT_GUARD_DELTA: cfg[CONF_COMFORT_GUARD_DELTA],
         }
-        self.debug = {k: None for k in DEBUG_KEYS}
-
-        self._unsubs = []
 
-    async def async_added(self) -> None:
-        """Register state listeners."""
+    def _watched_entities(self) -> set[str]:
         watched = [
-            self.cfg[CONF_INDOOR_TEMP_SENSOR],
+            *self.indoor_sensors,
             self.cfg[CONF_WEATHER_ENTITY],
-            self.cfg[CONF_HEATER_SWITCH],
+            *self.heater_switches,
             self.cfg[CONF_SOLAR_CURRENT_HOUR],
             self.cfg[CONF_SOLAR_NEXT_HOUR],
             self.cfg[CONF_SOLAR_TODAY_REMAINING],
@@ -132,33 +249,281 @@ class RoomController:
             watched.append(self.cfg[CONF_OUTDOOR_TEMP_SENSOR])
         if self.cfg.get(CONF_FLOW_TEMP_SENSOR):
             watched.append(self.cfg[CONF_FLOW_TEMP_SENSOR])
+        if self.cfg.get(CONF_FLOOR_TEMP_SENSOR):
+            watched.append(self.cfg[CONF_FLOOR_TEMP_SENSOR])
+        watched.extend(self.cfg.get(CONF_PRESENCE_ENTITIES) or [])
+        if self.cfg.get(CONF_WINDOW_CONTACT_SENSOR):
+            watched.append(self.cfg[CONF_WINDOW_CONTACT_SENSOR])
+        return set(watched)
+
+    @property
+    def indoor_sensors(self) -> list[str]:
+        sensors = self.cfg[CONF_INDOOR_TEMP_SENSOR]
+        return [sensors] if isinstance(sensors, str) else list(sensors)
+
+    @property
+    def indoor_temp(self) -> float | None:
+        return self.indoor_fusion.value
+
+    def _build_fusion(self) -> SensorFusion:
+        return SensorFusion(
+            self.indoor_sensors,
+            parse_weights(self.cfg.get(CONF_INDOOR_WEIGHTS)),
+            self.cfg[CONF_INDOOR_FUSION],
+        )
+
+    def _seed_fusion(self) -> None:
+        for entity_id in self.indoor_fusion.sources:
+            self._update_fusion_source(entity_id, self.hass.states.get(entity_id))
+
+    def _update_fusion_source(self, entity_id: str, state: State | None) -> None:
+        if state is None:
+            self.indoor_fusion.update(entity_id, None, None)
+            return
+        self.indoor_fusion.update(entity_id, self._state_float(state), self._reported(state))
+
+    @property
+    def heater_switches(self) -> list[str]:
+        switches = self.cfg[CONF_HEATER_SWITCH]
+        return [switches] if isinstance(switches, str) else list(switches)
 
-        for entity_id in watched:
-            self._unsubs.append(
-                async_track_state_change_event(
-                    self.hass, [entity_id], self._debounced_recalculate
-                )
+    @property
+    def manifold(self) -> str | None:
+        return self.cfg.get(CONF_MANIFOLD) or None
+
+    def _sync_subscriptions(self) -> None:
+        watched = self._watched_entities()
+        for entity_id in self._unsubs.keys() - watched:
+            self._unsubs.pop(entity_id)()
+        for entity_id in watched - self._unsubs.keys():
+            self._unsubs[entity_id] = async_track_state_change_event(
+                self.hass, [entity_id], self._debounced_recalculate
             )
 
+    def async_prime(self) -> None:
+        """Read current inputs and mode so a recalculation works before listeners are attached."""
+        self._seed_fusion()
+        if self.schedule is not None:
+            self.async_set_mode(self.schedule.mode_at(as_local(utcnow())))
+
+    async def async_added(self) -> None:
+        """Register state listeners."""
+        self._seed_fusion()
+        self._sync_subscriptions()
+        self._start_schedule()
+        self._start_pwm()
+
     async def async_will_remove(self) -> None:
-        for unsub in self._unsubs:
+        for unsub in self._unsubs.values():
+            unsub()
+        self._unsubs.clear()
+        self._cancel_transition()
+        self._clear_window_open()
+        self._cancel_pwm()
+
+    def async_reconfigure(self, cfg: dict[str, Any]) -> bool:
+        """Swap in a new config, keeping learned state. Returns False if unchanged."""
+        if cfg == self._source_cfg:
+            return False
+        schedule_changed = cfg.get(CONF_SCHEDULE) != self._source_cfg.get(CONF_SCHEDULE)
+        self._source_cfg = dict(cfg)
+        self.cfg = dict(cfg)
+        self._fingerprint = None
+        self._comfort_tuning = self._tuning_from(cfg)
+        self.async_set_mode(self.mode)
+        self.indoor_fusion = self._build_fusion()
+        self._seed_fusion()
+        self._sync_subscriptions()
+        self.indoor_samples.set_horizons(self._indoor_horizons())
+        self.outdoor_samples.set_horizons(self._outdoor_horizons())
+        if schedule_changed:
+            self.schedule = WeeklySchedule.parse(cfg.get(CONF_SCHEDULE))
+            self._start_schedule()
+        self._start_pwm()
+        return True
+
+    @property
+    def pwm_enabled(self) -> bool:
+        return self.cfg[CONF_OUTPUT_MODE] == OUTPUT_PWM
+
+    def _start_pwm(self) -> None:
+        self._cancel_pwm()
+        self._pwm_next_start = None
+        if not self.pwm_enabled:
+            self.pi.reset()
+            self.duty_cycle = 0.0
+            return
+        self._unsub_pwm.append(
+            async_track_point_in_time(self.hass, self._async_pwm_cycle, utcnow())
+        )
+
+    def _cancel_pwm(self) -> None:
+        for unsub in self._unsub_pwm:
             unsub()
+        self._unsub_pwm.clear()
+
+    def _pwm_cycle_start(self, now: datetime, period: timedelta) -> datetime:
+        """Latest period boundary, shifted by the phase assigned by the coordinator."""
+        seconds = period.total_seconds()
+        ts = now.timestamp()
+        return datetime.fromtimestamp(ts - (ts - self.pwm_phase * seconds) % seconds, tz=now.tzinfo)
+
+    def _pwm_on_time(self, period: timedelta) -> timedelta:
+        """On-time for the current duty, snapped so min-on/min-off hold."""
+        on_time = period * self.duty_cycle
+        if on_time < timedelta(minutes=self.cfg[CONF_MIN_ON_MINUTES]):
+            return timedelta(0)
+        if period - on_time < timedelta(minutes=self.cfg[CONF_MIN_OFF_MINUTES]):
+            return period
+        return on_time
+
+    async def _async_pwm_cycle(self, now: datetime) -> None:
+        """Start a PWM period: switch on and arm the exact off edge and next period.
+
+        The phase is latched per period; a new phase from the coordinator
+        applies from its first boundary after the current period ends.
+        """
+        self._cancel_pwm()
+        period = timedelta(minutes=self.cfg[CONF_PWM_PERIOD_MINUTES])
+        joining = self._pwm_next_start is None
+        cycle_start = self._pwm_cycle_start(now, period) if joining else self._pwm_next_start
+        cycle_end = cycle_start + period
+        next_start = self._pwm_cycle_start(cycle_end, period)
+        if next_start < cycle_end:
+            next_start += period
+        on_until = cycle_start + self._pwm_on_time(period)
+        self._pwm_on = now < on_until
+        if joining and on_until - now < timedelta(minutes=self.cfg[CONF_MIN_ON_MINUTES]):
+            # Too little of the on-window is left to honour min-on.
+            self._pwm_on = False
+        if self._pwm_on and on_until < cycle_end:
+            self._unsub_pwm.append(
+                async_track_point_in_time(self.hass, self._async_pwm_off, on_until)
+            )
+        self._pwm_next_start = next_start
+        self._unsub_pwm.append(
+            async_track_point_in_time(self.hass, self._async_pwm_cycle, next_start)
+        )
+        await self._apply_switch_request(self._pwm_on)
+
+    async def _async_pwm_off(self, _now: datetime) -> None:
+        self._pwm_on = False
+        await self._apply_switch_request(False)
+
+    def _start_schedule(self) -> None:
+        self._cancel_transition()
+        if self.schedule is None:
+            return
+        now = as_local(utcnow())
+        self.async_set_mode(self.schedule.mode_at(now))
+        self._schedule_transition(now)
+
+    def _schedule_transition(self, after: datetime) -> None:
+        """Arm a one-shot timer for the next schedule transition after ``after``."""
+        when, mode = self.schedule.next_transition(after)
+        fire_at = when - self._preheat_lead(self.schedule.mode_at(after), mode)
+        self._next_transition = (when, mode)
+        self._unsub_transition = async_track_point_in_time(self.hass, self._async_transition, fire_at)
+
+    def _cancel_transition(self) -> None:
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+        self._next_transition = None
+
+    def _preheat_lead(self, from_mode: str, to_mode: str) -> timedelta:
+        """Start warming early enough to reach the lower setback in time."""
+        rise = self._setback(from_mode) - self._setback(to_mode)
+        if rise <= 0:
+            return timedelta(0)
+        rate = max(self.heating_rate_cph or PREHEAT_DEFAULT_RATE_CPH, PREHEAT_MIN_RATE_CPH)
+        return timedelta(hours=min(rise / rate, PREHEAT_MAX_HOURS))
+
+    async def _async_transition(self, _now: datetime) -> None:
+        self._unsub_transition = None
+        when, mode = self._next_transition
+        self.async_set_mode(mode)
+        self._schedule_transition(when)
+        await self.request_callback(self.room_id)
 
     async def _debounced_recalculate(self, event) -> None:
-        del event
+        entity_id = event.data["entity_id"]
+        if entity_id == self.cfg.get(CONF_FLOOR_TEMP_SENSOR):
+            # Fast path: re-evaluate the floor limit against the last request
+            # without waiting for a full recalculation.
+            await self._apply_switch_request(self.heat_request)
+            if self.update_callback is not None:
+                self.update_callback()
+            return
+        if entity_id in self.indoor_fusion:
+            self._update_fusion_source(entity_id, event.data["new_state"])
         await self.request_callback(self.room_id)
 
+    @staticmethod
+    def _state_float(state: State, attr: str | None = None) -> float | None:
+        raw = state.attributes.get(attr) if attr else state.state
+        try:
+            return float(raw)
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def _reported(state: State) -> datetime:
+        return getattr(state, "last_reported", None) or state.last_updated
+
     def _f(self, entity_id: str | None, attr: str | None = None) -> float | None:
         if not entity_id:
             return None
         state = self.hass.states.get(entity_id)
         if state is None:
             return None
-        raw = state.attributes.get(attr) if attr else state.state
-        try:
-            return float(raw)
-        except (TypeError, ValueError):
+        return self._state_float(state, attr)
+
+    def _stale_cutoff(self, now: datetime) -> datetime:
+        return now - timedelta(minutes=self.cfg[CONF_STALE_MINUTES])
+
+    def _filtered(self, entity_id: str | None, flt: SampleFilter, now: datetime) -> float | None:
+        """Read a sensor through the staleness, rate and outlier filters."""
+        state = self.hass.states.get(entity_id) if entity_id else None
+        value = self._state_float(state) if state is not None else None
+        if value is None:
+            return None
+        reported = self._reported(state)
+        if reported < self._stale_cutoff(now):
+            flt.reject_stale(reported)
+            return None
+        if not flt.accept(reported, value, self.cfg[CONF_MAX_RATE_CPH]):
             return None
+        return value
+
+    def _fused_indoor(self, now: datetime) -> tuple[float, bool] | None:
+        """Indoor value to control on, and whether it is a newly accepted sample.
+
+        A fused reading the filter rejects falls back to the last accepted
+        one; None means no source has reported recently enough to use.
+        """
+        cutoff = self._stale_cutoff(now)
+        for entity_id in self.indoor_fusion.sources:
+            # Re-reporting an unchanged value fires no state_changed event,
+            # so pick up newer report times before expiring.
+            state = self.hass.states.get(entity_id)
+            if state is None:
+                continue
+            reported = self._reported(state)
+            last = self.indoor_fusion.reported_at(entity_id)
+            if reported >= cutoff and (last is None or reported > last):
+                self._update_fusion_source(entity_id, state)
+        for _ in range(self.indoor_fusion.expire(cutoff)):
+            self.indoor_filter.reject_stale()
+        indoor = self.indoor_fusion.value
+        if indoor is None:
+            return None
+        reported = self.indoor_fusion.reported
+        if self.indoor_filter.accept(reported, indoor, self.cfg[CONF_MAX_RATE_CPH]):
+            return indoor, True
+        if self.indoor_filter.last is None:
+            return None
+        return self.indoor_filter.last[1], False
 
     def _calc_orientation_factor(self) -> float:
         if self.cfg.get(CONF_ORIENTATION_FACTOR) is not None:
@@ -183,27 +548,19 @@ class RoomController:
             result = None
         return result if result is not None else self.base_setpoint
 
-    def _trim_window(self, buffer: deque[tuple[datetime, float]], now: datetime) -> None:
-        cutoff = now - timedelta(minutes=60)
-        while buffer and buffer[0][0] < cutoff:
-            buffer.popleft()
-
-    def _slope_cph(self, buffer: deque[tuple[datetime, float]]) -> float:
-        if len(buffer) < 2:
-            return 0.0
-        oldest_ts, oldest = buffer[0]
-        latest_ts, latest = buffer[-1]
-        dt_h = (latest_ts - oldest_ts).total_seconds() / 3600
-        if dt_h <= 0:
-            return 0.0
-        return (latest - oldest) / dt_h
+    def _indoor_horizons(self) -> dict[str, timedelta]:
+        return {
+            HORIZON_SHORT: timedelta(minutes=self.cfg[CONF_SHORT_WINDOW_MINUTES]),
+            HORIZON_TREND: timedelta(minutes=self.cfg[CONF_TREND_WINDOW_MINUTES]),
+            HORIZON_LONG: timedelta(minutes=self.cfg[CONF_LONG_WINDOW_MINUTES]),
+            HORIZON_WINDOW: timedelta(minutes=self.cfg[CONF_WINDOW_DETECT_MINUTES]),
+        }
+
+    def _outdoor_horizons(self) -> dict[str, timedelta]:
+        return {HORIZON_TREND: timedelta(minutes=self.cfg[CONF_TREND_WINDOW_MINUTES])}
 
     def _outdoor_drop_gain(self) -> float:
-        if len(self.outdoor_samples) < 2:
-            return 1.0
-        oldest = self.outdoor_samples[0][1]
-        latest = self.outdoor_samples[-1][1]
-        outdoor_drop = latest - oldest
+        outdoor_drop = self.outdoor_samples.change(HORIZON_TREND)
         return max(1.0, min(1.5, 1.0 + max(0.0, -outdoor_drop) / 4.0))
 
     def _clamp(self, val: float, low: float, high: float) -> float:
@@ -211,9 +568,12 @@ class RoomController:
 
     async def async_recalculate_and_control(self) -> None:
         now = utcnow()
-        indoor = self._f(self.cfg[CONF_INDOOR_TEMP_SENSOR])
-        if indoor is None:
+        fused = self._fused_indoor(now)
+        if fused is None:
+            await self._async_control_without_indoor()
             return
+        indoor, accepted = fused
+        self.indoor_stale = False
 
         weather = self.hass.states.get(self.cfg[CONF_WEATHER_ENTITY])
         wind_speed = 0.0
@@ -224,24 +584,35 @@ class RoomController:
             wind_gust = float(weather.attributes.get("wind_gust_speed", wind_speed) or wind_speed)
             weather_outdoor = weather.attributes.get("temperature")
 
-        outdoor = self._f(self.cfg.get(CONF_OUTDOOR_TEMP_SENSOR))
+        outdoor = self._filtered(self.cfg.get(CONF_OUTDOOR_TEMP_SENSOR), self.outdoor_filter, now)
         if outdoor is None and weather_outdoor is not None:
             try:
                 outdoor = float(weather_outdoor)
             except (TypeError, ValueError):
                 outdoor = None
+        self.outdoor_temp = outdoor
 
         flow_temp = self._f(self.cfg.get(CONF_FLOW_TEMP_SENSOR))
-        base = self._base_setpoint()
-
-        self.base_setpoint = base
-        self.indoor_samples.append((now, indoor))
-        self._trim_window(self.indoor_samples, now)
-        self.trend_cph = self._slope_cph(self.indoor_samples)
+        mode = self.effective_mode
+        if mode != self._tuned_mode:
+            self._apply_mode_tuning()
+        setback = self._setback(mode)
+        self.base_setpoint = self._base_setpoint()
+        base = self.base_setpoint - setback
+
+        if accepted:
+            self.indoor_samples.append(now, indoor)
+        self.trend_cph = self.indoor_samples.slope_cph(HORIZON_TREND)
+        self._detect_window_open(now)
+        if self.is_heating and self.trend_cph > 0:
+            self.heating_rate_cph = (
+                self.trend_cph
+                if self.heating_rate_cph is None
+                else 0.9 * self.heating_rate_cph + 0.1 * self.trend_cph
+            )
 
         if outdoor is not None:
-            self.outdoor_samples.append((now, outdoor))
-            self._trim_window(self.outdoor_samples, now)
+            self.outdoor_samples.append(now, outdoor)
         self.outdoor_drop_gain = self._outdoor_drop_gain()
 
         cur = self._f(self.cfg[CONF_SOLAR_CURRENT_HOUR]) or 0.0
@@ -249,17 +620,68 @@ class RoomController:
         rem = self._f(self.cfg[CONF_SOLAR_TODAY_REMAINING]) or 0.0
         tom = self._f(self.cfg[CONF_SOLAR_TOMORROW]) or 0.0
 
+        forecast_wind = wind_speed
+        forecast_gust = wind_gust
+        forecast_outdoor = outdoor
+        points = self.forecast_callback(self.cfg[CONF_WEATHER_ENTITY]) if self.cfg[CONF_ENABLE_FORECAST] else []
+        if points:
+            tau = self.cfg[CONF_TAU_HOURS]
+            forecast_wind = weighted_lookahead(points, "wind_speed", wind_speed, now, tau)
+            forecast_gust = weighted_lookahead(points, "wind_gust_speed", wind_gust, now, tau)
+            if outdoor is not None:
+                forecast_outdoor = weighted_lookahead(points, "temperature", outdoor, now, tau)
+
+        comfort_guard = indoor < (base - self.cfg[CONF_COMFORT_GUARD_DELTA])
+        flow_guard = (
+            self.cfg[CONF_ENABLE_FLOW_GUARD]
+            and flow_temp is not None
+            and flow_temp < self.cfg[CONF_FLOW_LOW_THRESHOLD]
+        )
+        fingerprint = (
+            mode,
+            base,
+            comfort_guard,
+            flow_guard,
+            _quantise(indoor, FINGERPRINT_TEMP_STEP),
+            _quantise(forecast_outdoor, FINGERPRINT_TEMP_STEP),
+            _quantise(forecast_wind, FINGERPRINT_WIND_STEP),
+            _quantise(forecast_gust, FINGERPRINT_WIND_STEP),
+            _quantise(cur, FINGERPRINT_SOLAR_STEP),
+            _quantise(nxt, FINGERPRINT_SOLAR_STEP),
+            _quantise(rem, FINGERPRINT_SOLAR_STEP),
+            _quantise(tom, FINGERPRINT_SOLAR_STEP),
+            _quantise(self.trend_cph, FINGERPRINT_TREND_STEP),
+            _quantise(self.outdoor_drop_gain, FINGERPRINT_GAIN_STEP),
+        )
+        if fingerprint == self._fingerprint:
+            # Nothing that feeds the offsets moved; only the timing-dependent
+            # switch decision needs re-evaluating.
+            self.memo_hits += 1
+            request_heat = await self._control(indoor, self.computed_final_setpoint, now)
+            self.debug = {
+                **self.debug,
+                "heating_request": request_heat,
+                "duty_cycle": round(self.duty_cycle, 3) if self.pwm_enabled else None,
+                "predicted_change": (
+                    round(self.predicted_change, 3) if self.predicted_change is not None else None
+                ),
+                "window_open": self.window_open,
+                "indoor_stale": False,
+            }
+            return
+        self.memo_misses += 1
+        self._fingerprint = fingerprint
+
         solar_impulse = cur * 1.0 + nxt * 1.2 + rem * 0.25 + tom * 0.1
         solar_score = self._clamp(solar_impulse / max(0.1, self.cfg[CONF_SOLAR_NORM_KWH]), 0.0, 1.0)
-
-        w_eff = wind_speed + (wind_gust - wind_speed) * 0.25
+        w_eff = forecast_wind + (forecast_gust - forecast_wind) * 0.25
         wind_span = max(0.1, self.cfg[CONF_WIND_NORM_KMH] - self.cfg[CONF_WIND_BASE_KMH])
         wind_score = self._clamp((w_eff - self.cfg[CONF_WIND_BASE_KMH]) / wind_span, 0.0, 1.0)
 
         outdoor_score = 0.0
-        if outdoor is not None:
+        if forecast_outdoor is not None:
             denom = max(0.1, self.cfg[CONF_OUTDOOR_BASE_C] - self.cfg[CONF_OUTDOOR_NORM_C])
-            outdoor_score = self._clamp((self.cfg[CONF_OUTDOOR_BASE_C] - outdoor) / denom, 0.0, 1.0)
+            outdoor_score = self._clamp((self.cfg[CONF_OUTDOOR_BASE_C] - forecast_outdoor) / denom, 0.0, 1.0)
 
         solar_gain = self._clamp(1 + self.trend_cph / 1.5, 0.8, 1.4)
         wind_gain = self._clamp(1 + (-self.trend_cph) / 1.2, 0.8, 1.5)
@@ -285,13 +707,7 @@ class RoomController:
             offsets.outdoor = outdoor_score * self.cfg[CONF_MAX_OUTDOOR_BOOST_DEGC] * outdoor_gain
 
         total_offset = offsets.total
-        if indoor < (base - self.cfg[CONF_COMFORT_GUARD_DELTA]):
-            total_offset = max(total_offset, -0.1)
-        if (
-            self.cfg[CONF_ENABLE_FLOW_GUARD]
-            and flow_temp is not None
-            and flow_temp < self.cfg[CONF_FLOW_LOW_THRESHOLD]
-        ):
+        if comfort_guard or flow_guard:
             total_offset = max(total_offset, -0.1)
 
         raw = base + total_offset
@@ -305,21 +721,18 @@ class RoomController:
             "total": total_offset,
         }
 
-        request_heat = self.is_heating
-        hyst = self.cfg[CONF_HYSTERESIS_DEGC]
-        if indoor <= (final_sp - hyst):
-            request_heat = True
-        elif indoor >= (final_sp + hyst):
-            request_heat = False
-
-        await self._apply_switch_request(request_heat)
+        request_heat = await self._control(indoor, final_sp, now)
 
         self.debug = {
             "base_setpoint": round(base, 3),
+            "mode": mode,
+            "setback": round(setback, 3),
             "indoor_temp": round(indoor, 3),
             "outdoor_temp": round(outdoor, 3) if outdoor is not None else None,
             "wind_speed": round(wind_speed, 3),
             "wind_gust_speed": round(wind_gust, 3),
+            "forecast_wind": round(w_eff, 3),
+            "forecast_outdoor": round(forecast_outdoor, 3) if forecast_outdoor is not None else None,
             "solar_impulse": round(solar_impulse, 3),
             "solar_score": round(solar_score, 3),
             "wind_score": round(wind_score, 3),
@@ -337,41 +750,207 @@ class RoomController:
             "trend_cph": round(self.trend_cph, 3),
             "outdoor_drop_gain": round(self.outdoor_drop_gain, 3),
             "heating_request": request_heat,
+            "duty_cycle": round(self.duty_cycle, 3) if self.pwm_enabled else None,
+            "predicted_change": (
+                round(self.predicted_change, 3) if self.predicted_change is not None else None
+            ),
+            "window_open": self.window_open,
+            "indoor_stale": False,
+        }
+
+    async def _async_control_without_indoor(self) -> None:
+        """Turn the heater off, once min-on allows, until an indoor reading is fresh again."""
+        self.indoor_stale = True
+        # Recompute everything once a reading returns.
+        self._fingerprint = None
+        if self.pwm_enabled:
+            self.duty_cycle = 0.0
+            self._pwm_on = False
+        await self._apply_switch_request(False)
+        self.debug = {
+            **self.debug,
+            "indoor_temp": None,
+            "heating_request": False,
+            "duty_cycle": 0.0 if self.pwm_enabled else None,
+            "indoor_stale": True,
         }
 
+    async def _control(self, indoor: float, final_sp: float, now: datetime) -> bool:
+        """Turn the setpoint into a heat request and apply it; returns the request."""
+        if self.predicted_change is not None:
+            # Act on where the coupled model expects the room to be by the next cycle.
+            indoor += self.predicted_change
+        if self.pwm_enabled:
+            # Edges are driven by the PWM timers; a recalculation only updates the duty.
+            self.duty_cycle = self.pi.update(
+                final_sp - indoor,
+                now,
+                self.cfg[CONF_PWM_KP],
+                self.cfg[CONF_PWM_KI],
+                hold=self.window_open,
+            )
+            request_heat = self._pwm_on
+        else:
+            request_heat = self.is_heating
+            hyst = self.cfg[CONF_HYSTERESIS_DEGC]
+            if indoor <= (final_sp - hyst):
+                request_heat = True
+            elif indoor >= (final_sp + hyst):
+                request_heat = False
+
+        await self._apply_switch_request(request_heat)
+        return request_heat
+
+    def _detect_window_open(self, now: datetime) -> None:
+        """Suspend heating on a sharp indoor drop over the short detection window."""
+        contact = self.cfg.get(CONF_WINDOW_CONTACT_SENSOR)
+        if contact:
+            contact_state = self.hass.states.get(contact)
+            if contact_state is not None and contact_state.state == "off":
+                self._clear_window_open()
+                return
+        if not self.cfg[CONF_ENABLE_WINDOW_DETECTION] or self.window_open:
+            return
+        if -self.indoor_samples.change(HORIZON_WINDOW) < self.cfg[CONF_WINDOW_DROP_DEGC]:
+            return
+        if contact and (contact_state is None or contact_state.state != "on"):
+            return
+        self.window_open_until = now + timedelta(minutes=self.cfg[CONF_WINDOW_SUSPEND_MINUTES])
+        self._unsub_window = async_track_point_in_time(
+            self.hass, self._async_window_suspend_ended, self.window_open_until
+        )
+
+    def _clear_window_open(self) -> None:
+        if self._unsub_window is not None:
+            self._unsub_window()
+            self._unsub_window = None
+        self.window_open_until = None
+
+    async def _async_window_suspend_ended(self, _now: datetime) -> None:
+        self._unsub_window = None
+        self.window_open_until = None
+        await self.request_callback(self.room_id)
+
+    @property
+    def window_open(self) -> bool:
+        return self.window_open_until is not None and utcnow() < self.window_open_until
+
+    @property
+    def memo_hit_ratio(self) -> float | None:
+        total = self.memo_hits + self.memo_misses
+        return self.memo_hits / total if total else None
+
+    @property
+    def floor_temp(self) -> float | None:
+        return self._f(self.cfg.get(CONF_FLOOR_TEMP_SENSOR))
+
+    def _update_floor_limit(self) -> str | None:
+        """Floor limit in force, held until the floor is a margin back inside the band."""
+        floor = self.floor_temp
+        floor_max = self.cfg[CONF_FLOOR_MAX_C]
+        floor_min = self.cfg[CONF_FLOOR_MIN_C]
+        if floor is None:
+            limit = None
+        elif floor >= floor_max:
+            limit = FLOOR_LIMIT_MAX
+        elif floor <= floor_min:
+            limit = FLOOR_LIMIT_MIN
+        elif self.floor_limit == FLOOR_LIMIT_MAX and floor > floor_max - FLOOR_LIMIT_MARGIN_DEGC:
+            limit = FLOOR_LIMIT_MAX
+        elif self.floor_limit == FLOOR_LIMIT_MIN and floor < floor_min + FLOOR_LIMIT_MARGIN_DEGC:
+            limit = FLOOR_LIMIT_MIN
+        else:
+            limit = None
+        self.floor_limit = limit
+        return limit
+
     async def _apply_switch_request(self, request_heat: bool) -> None:
         now = utcnow()
-        if self.last_switch_change_ts is None:
+        self.heat_request = request_heat
+        if self.window_open:
+            request_heat = False
+        floor_limit = self._update_floor_limit()
+        if floor_limit == FLOOR_LIMIT_MAX:
+            request_heat = False
+        elif floor_limit == FLOOR_LIMIT_MIN:
+            request_heat = True
+
+        current = self.is_heating if self._switch_pending is None else self._switch_pending
+        if self.last_switch_change_ts is None or floor_limit == FLOOR_LIMIT_MAX:
             allowed = True
         else:
             elapsed = now - self.last_switch_change_ts
             min_on = timedelta(minutes=self.cfg[CONF_MIN_ON_MINUTES])
             min_off = timedelta(minutes=self.cfg[CONF_MIN_OFF_MINUTES])
             if request_heat:
-                allowed = (not self.is_heating) and elapsed >= min_off
+                allowed = (not current) and elapsed >= min_off
             else:
-                allowed = self.is_heating and elapsed >= min_on
+                allowed = current and elapsed >= min_on
 
-        if request_heat == self.is_heating:
+        if request_heat == current:
             return
         if not allowed:
             return
 
-        service = "turn_on" if request_heat else "turn_off"
-        await self.hass.services.async_call(
-            "switch",
-            service,
-            {"entity_id": self.cfg[CONF_HEATER_SWITCH]},
-            blocking=True,
-        )
-        self.is_heating = request_heat
+        # The switch callback confirms or abandons the switch once it has been sent.
+        self._switch_pending = request_heat
+        await self.switch_callback(self, request_heat)
+
+    def confirm_switch(self, on: bool, now: datetime | None = None) -> None:
+        """Record a switch whose service call succeeded."""
+        now = now or utcnow()
+        self._switch_pending = None
+        self.set_heating_state(on, now)
         self.last_switch_change_ts = now
 
+    def abandon_switch(self) -> None:
+        """Forget a switch whose service call failed, so the next recalculation retries it."""
+        self._switch_pending = None
+
+    def set_heating_state(self, on: bool, now: datetime | None = None) -> None:
+        """Record the actuator state and feed the energy meter."""
+        self.energy.switched(on, now or utcnow(), self.cfg[CONF_HEATER_POWER_W])
+        self.is_heating = on
+
+    @property
+    def energy_kwh(self) -> float:
+        return self.energy.total_kwh(utcnow(), self.cfg[CONF_HEATER_POWER_W])
+
+    @property
+    def heating_hours(self) -> float:
+        return self.energy.total_hours(utcnow())
+
+    @property
+    def occupied(self) -> bool | None:
+        """Presence across the configured entities, or None when none are configured."""
+        entities = self.cfg.get(CONF_PRESENCE_ENTITIES)
+        if not entities:
+            return None
+        return any(
+            (state := self.hass.states.get(entity_id)) is not None and state.state in PRESENT_STATES
+            for entity_id in entities
+        )
+
+    @property
+    def effective_mode(self) -> str:
+        return MODE_AWAY if self.occupied is False else self.mode
+
+    def _setback(self, mode: str) -> float:
+        if mode == MODE_AWAY:
+            return self.cfg[CONF_AWAY_SETBACK_C]
+        if mode == MODE_ECO:
+            return self.cfg[CONF_ECO_SETBACK_C]
+        return 0.0
+
     def async_set_mode(self, mode: str) -> None:
         self.mode = mode
+        self._apply_mode_tuning()
+
+    def _apply_mode_tuning(self) -> None:
+        mode = self._tuned_mode = self.effective_mode
         for key, value in self._comfort_tuning.items():
             self.cfg[key] = value
-        if mode == MODE_ECO:
+        if mode in (MODE_ECO, MODE_AWAY):
             self.cfg[CONF_MAX_COOLING_DEGC] = self._comfort_tuning[CONF_MAX_COOLING_DEGC] * 0.7
             self.cfg[CONF_MAX_WIND_BOOST_DEGC] = self._comfort_tuning[CONF_MAX_WIND_BOOST_DEGC] * 0.7
             self.cfg[CONF_MAX_OUTDOOR_BOOST_DEGC] = self._comfort_tuning[CONF_MAX_OUTDOOR_BOOST_DEGC] * 0.7
@@ -380,8 +959,13 @@ class RoomController:
     def reset_learning(self) -> None:
         self.indoor_samples.clear()
         self.outdoor_samples.clear()
+        self.indoor_filter.reset()
+        self.outdoor_filter.reset()
         self.trend_cph = 0.0
         self.outdoor_drop_gain = 1.0
+        self.heating_rate_cph = None
+        self.pi.reset()
+        self._fingerprint = None
 
     @property
     def extra_attrs(self) -> dict[str, Any]:
@@ -391,10 +975,36 @@ class RoomController:
             ATTR_EFFECTIVE_TARGET: round(self.computed_final_setpoint, 2),
             ATTR_OFFSETS: self.current_offsets,
             ATTR_TREND_CPH: round(self.trend_cph, 3),
+            ATTR_TRENDS_CPH: {
+                horizon: round(self.indoor_samples.slope_cph(horizon), 3)
+                for horizon in (HORIZON_SHORT, HORIZON_TREND, HORIZON_LONG)
+            },
             ATTR_OUTDOOR_DROP_GAIN: round(self.outdoor_drop_gain, 3),
             ATTR_LAST_SWITCH_CHANGE_TS: self.last_switch_change_ts.isoformat()
             if self.last_switch_change_ts
             else None,
+            ATTR_MODE: self.effective_mode,
+            ATTR_DUTY_CYCLE: round(self.duty_cycle, 3) if self.pwm_enabled else None,
+            ATTR_PWM_PHASE: round(self.pwm_phase, 3) if self.pwm_enabled else None,
+            ATTR_RECALC_MEMO: {"hits": self.memo_hits, "misses": self.memo_misses},
+            ATTR_THERMAL_MODEL: self.thermal_params,
+            ATTR_NEXT_TRANSITION: {
+                "at": self._next_transition[0].isoformat(),
+                "mode": self._next_transition[1],
+            }
+            if self._next_transition
+            else None,
+            ATTR_HEATING_RATE_CPH: round(self.heating_rate_cph, 3)
+            if self.heating_rate_cph is not None
+            else None,
+            ATTR_WINDOW_OPEN_UNTIL: self.window_open_until.isoformat() if self.window_open else None,
+            ATTR_FLOOR_TEMP: self.floor_temp,
+            ATTR_FLOOR_LIMIT: self.floor_limit,
+            ATTR_INDOOR_STALE: self.indoor_stale,
+            ATTR_REJECTED_SAMPLES: {
+                "indoor": dict(self.indoor_filter.rejected),
+                "outdoor": dict(self.outdoor_filter.rejected),
+            },
         }
 
     @property
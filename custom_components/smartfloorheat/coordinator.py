@@ -2,51 +2,365 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Iterable
+from datetime import datetime, timedelta
 import logging
 from typing import Any
 
+import numpy as np
+
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import slugify
+from homeassistant.util.dt import utcnow
 
-from .const import CONF_ROOM_ID, CONF_UPDATE_INTERVAL_SECONDS, DOMAIN
+from .const import (
+    CONF_ADJACENT_ROOMS,
+    CONF_ENABLE_FORECAST,
+    CONF_HEATER_POWER_W,
+    CONF_HEATER_SWITCH,
+    CONF_INDOOR_TEMP_SENSOR,
+    CONF_PWM_PERIOD_MINUTES,
+    CONF_ROOM_ID,
+    CONF_ROOM_NAME,
+    CONF_ROOMS,
+    CONF_UPDATE_INTERVAL_SECONDS,
+    CONF_WEATHER_ENTITY,
+    DEFAULTS,
+    DOMAIN,
+    ENERGY_SAVE_DELAY_SECONDS,
+    ENERGY_STORAGE_VERSION,
+)
 from .controllers import RoomController
+from .forecast import ForecastCache
+from .pwm import PhasePlanner
+from .telemetry import TelemetryExporter, telemetry_options
+from .thermal import ThermalModel
+
+PhaseGroup = tuple[str | None, int]
+
+
+def compile_room_configs(entry: ConfigEntry) -> list[dict[str, Any]]:
+    """Merge entry data, per-room options and defaults into room configs."""
+    overrides = entry.options.get(CONF_ROOMS, {})
+    compiled = []
+    for room in entry.data.get(CONF_ROOMS, []):
+        room_id = room.get(CONF_ROOM_ID) or slugify(room[CONF_ROOM_NAME])
+        cfg = {**DEFAULTS, **overrides.get(room_id, room)}
+        cfg[CONF_ROOM_NAME] = room[CONF_ROOM_NAME]
+        cfg[CONF_ROOM_ID] = room_id
+        for key in (CONF_INDOOR_TEMP_SENSOR, CONF_HEATER_SWITCH):
+            if isinstance(cfg[key], str):
+                cfg[key] = [cfg[key]]
+        compiled.append(cfg)
+    return compiled
 
 
 class SmartFloorHeatCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Coordinates room updates."""
 
-    def __init__(self, hass: HomeAssistant, room_cfgs: list[dict[str, Any]]) -> None:
-        min_interval = min(cfg[CONF_UPDATE_INTERVAL_SECONDS] for cfg in room_cfgs)
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        room_cfgs: list[dict[str, Any]],
+        entry_id: str,
+        options: dict[str, Any] | None = None,
+    ) -> None:
         super().__init__(
             hass,
             logger=logging.getLogger(__name__),
             name=DOMAIN,
-            update_interval=timedelta(seconds=min_interval),
+            update_interval=self._interval_for(room_cfgs),
         )
+        self.forecasts = ForecastCache(hass)
         self.controllers: dict[str, RoomController] = {}
         for cfg in room_cfgs:
             room_id = cfg[CONF_ROOM_ID]
-            self.controllers[room_id] = RoomController(hass, cfg, self.async_recalculate_room)
+            self.controllers[room_id] = RoomController(
+                hass,
+                cfg,
+                self.async_recalculate_room,
+                self.async_switch_heaters,
+                self.forecasts.get,
+                self.async_update_listeners,
+            )
+        # Latest switch request per room while a batch is collected.
+        self._pending_switches: dict[str, bool] | None = None
+        # Switch states requested before HA has started, by room; None once started.
+        self._deferred_switches: dict[str, bool] | None = {}
+        self._planners: dict[PhaseGroup, PhasePlanner] = {}
+        self._phase_groups: dict[str, PhaseGroup] = {}
+        self._energy_store: Store[dict[str, Any]] = Store(
+            hass, ENERGY_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.energy"
+        )
+        self.telemetry_options = telemetry_options(options or {})
+        self.telemetry = TelemetryExporter.from_options(hass, self.telemetry_options)
+        self._exported: dict[str, dict[str, Any]] = {}
+        self.thermal: ThermalModel | None = None
+        self._thermal_adjacency: dict[str, list[str]] = {}
+        self._thermal_at: datetime | None = None
+        self._thermal_hours: np.ndarray | None = None
+        self._build_thermal(room_cfgs)
 
-    async def async_setup(self) -> None:
+    @staticmethod
+    def _interval_for(room_cfgs: list[dict[str, Any]]) -> timedelta:
+        return timedelta(seconds=min(cfg[CONF_UPDATE_INTERVAL_SECONDS] for cfg in room_cfgs))
+
+    def _build_thermal(self, room_cfgs: list[dict[str, Any]]) -> None:
+        """(Re)build the building model when the room adjacency changes."""
+        adjacency = {cfg[CONF_ROOM_ID]: list(cfg.get(CONF_ADJACENT_ROOMS) or []) for cfg in room_cfgs}
+        if adjacency == self._thermal_adjacency:
+            return
+        self._thermal_adjacency = adjacency
+        self._thermal_at = None
+        self.thermal = ThermalModel(list(self.controllers), adjacency) if any(adjacency.values()) else None
         for ctrl in self.controllers.values():
-            await ctrl.async_added()
+            ctrl.predicted_change = None
+            ctrl.thermal_params = None
+
+    def _step_thermal(self) -> None:
+        """Fit the interval since the last cycle, then predict one interval ahead for all rooms."""
+        now = utcnow()
+        ctrls = list(self.controllers.values())
+        temps = np.array([np.nan if ctrl.indoor_temp is None else ctrl.indoor_temp for ctrl in ctrls])
+        outdoor = np.array([np.nan if ctrl.outdoor_temp is None else ctrl.outdoor_temp for ctrl in ctrls])
+        hours = np.array([ctrl.heating_hours for ctrl in ctrls])
+        if self._thermal_at is None:
+            self.thermal.observe(temps, outdoor, np.zeros(len(ctrls)), 0.0)
+        else:
+            dt_h = (now - self._thermal_at).total_seconds() / 3600
+            duty = np.clip((hours - self._thermal_hours) / max(dt_h, 1e-9), 0.0, 1.0)
+            self.thermal.observe(temps, outdoor, duty, dt_h)
+        self._thermal_at, self._thermal_hours = now, hours
+
+        duty_ahead = np.array(
+            [ctrl.duty_cycle if ctrl.pwm_enabled else float(ctrl.is_heating) for ctrl in ctrls]
+        )
+        horizon_h = self.update_interval.total_seconds() / 3600
+        predicted = self.thermal.predict(temps, outdoor, duty_ahead, horizon_h)
+        for i, ctrl in enumerate(ctrls):
+            ctrl.predicted_change = None if np.isnan(predicted[i]) else float(predicted[i] - temps[i])
+            ctrl.thermal_params = self.thermal.params(i) if self.thermal.coupled[i] else None
+
+    async def async_setup(self) -> None:
+        """Restore stored state and read current inputs; no listeners or switching yet."""
+        stored = await self._energy_store.async_load() or {}
+        for room_id, ctrl in self.controllers.items():
+            ctrl.energy.restore(stored.get(room_id))
+            ctrl.async_prime()
+        if self.telemetry is not None:
+            self.telemetry.start()
+
+    async def async_start(self, _hass: HomeAssistant | None = None) -> None:
+        """Attach room listeners once HA has started and apply the held-back switching."""
+        await asyncio.gather(*(ctrl.async_added() for ctrl in self.controllers.values()))
+        deferred, self._deferred_switches = self._deferred_switches or {}, None
+        await self._async_dispatch_switches(deferred)
+        await self.async_refresh()
 
     async def async_unload(self) -> None:
         for ctrl in self.controllers.values():
             await ctrl.async_will_remove()
+        await self._energy_store.async_save(self._energy_data())
+        if self.telemetry is not None:
+            await self.telemetry.async_stop()
+
+    def _energy_data(self) -> dict[str, Any]:
+        now = utcnow()
+        data = {}
+        for room_id, ctrl in self.controllers.items():
+            ctrl.energy.checkpoint(now, ctrl.cfg[CONF_HEATER_POWER_W])
+            data[room_id] = ctrl.energy.as_dict()
+        return data
+
+    async def async_apply_room_configs(self, room_cfgs: list[dict[str, Any]]) -> None:
+        """Apply changed room configs in place, keeping untouched rooms as they are."""
+        previous = {room_id: ctrl.heater_switches for room_id, ctrl in self.controllers.items()}
+        changed = [
+            cfg[CONF_ROOM_ID]
+            for cfg in room_cfgs
+            if cfg[CONF_ROOM_ID] in self.controllers
+            and self.controllers[cfg[CONF_ROOM_ID]].async_reconfigure(cfg)
+        ]
+        if not changed:
+            return
+        self._build_thermal(room_cfgs)
+        self.update_interval = self._interval_for(room_cfgs)
+        for room_id in changed:
+            ctrl = self.controllers[room_id]
+            if ctrl.is_heating and ctrl.heater_switches != previous[room_id]:
+                await self._async_move_actuators(ctrl, previous[room_id])
+            await self.async_recalculate_room(room_id)
+
+    async def _async_move_actuators(self, ctrl: RoomController, previous: list[str]) -> None:
+        """Hand a heating room over to its new actuator list."""
+        removed = [entity_id for entity_id in previous if entity_id not in ctrl.heater_switches]
+        added = [entity_id for entity_id in ctrl.heater_switches if entity_id not in previous]
+        calls = [
+            (service, entity_ids)
+            for service, entity_ids in (("turn_off", removed), ("turn_on", added))
+            if entity_ids
+        ]
+        results = await asyncio.gather(
+            *(
+                self.hass.services.async_call("switch", service, {"entity_id": entity_ids}, blocking=True)
+                for service, entity_ids in calls
+            ),
+            return_exceptions=True,
+        )
+        for (service, entity_ids), result in zip(calls, results):
+            if not isinstance(result, BaseException):
+                continue
+            self.logger.warning("Switch %s failed for %s: %s", service, ", ".join(entity_ids), result)
+            if service == "turn_on":
+                # The new actuators are off; let the next recalculation switch them on.
+                ctrl.set_heating_state(False)
+
+    async def async_switch_heaters(self, ctrl: RoomController, turn_on: bool) -> None:
+        """Switch a room's actuators, queueing them while a batch is collected."""
+        if self._deferred_switches is not None:
+            # Confirmed by async_start once the held-back batch has been sent.
+            self._deferred_switches[ctrl.room_id] = turn_on
+            return
+        if self._pending_switches is not None:
+            self._pending_switches[ctrl.room_id] = turn_on
+            return
+        await self._async_dispatch_switches({ctrl.room_id: turn_on})
+
+    async def _async_dispatch_switches(self, requests: dict[str, bool]) -> None:
+        """Send one service call per manifold and direction, all concurrently.
+
+        Rooms are confirmed per call, so a failed call leaves its rooms'
+        heating state untouched and they retry on their next recalculation.
+        """
+        groups: dict[tuple[str | None, str], list[RoomController]] = {}
+        for room_id, turn_on in requests.items():
+            ctrl = self.controllers[room_id]
+            groups.setdefault((ctrl.manifold, "turn_on" if turn_on else "turn_off"), []).append(ctrl)
+        results = await asyncio.gather(
+            *(
+                self.hass.services.async_call(
+                    "switch",
+                    service,
+                    {"entity_id": [entity_id for ctrl in ctrls for entity_id in ctrl.heater_switches]},
+                    blocking=True,
+                )
+                for (_, service), ctrls in groups.items()
+            ),
+            return_exceptions=True,
+        )
+        now = utcnow()
+        for ((_, service), ctrls), result in zip(groups.items(), results):
+            if isinstance(result, BaseException):
+                self.logger.warning(
+                    "Switch %s failed for %s: %s", service, ", ".join(ctrl.room_id for ctrl in ctrls), result
+                )
+                for ctrl in ctrls:
+                    ctrl.abandon_switch()
+                continue
+            for ctrl in ctrls:
+                ctrl.confirm_switch(service == "turn_on", now)
+        if groups:
+            self._energy_store.async_delay_save(self._energy_data, ENERGY_SAVE_DELAY_SECONDS)
 
     async def async_recalculate_room(self, room_id: str) -> None:
         ctrl = self.controllers.get(room_id)
         if ctrl is None:
             return
         await ctrl.async_recalculate_and_control()
+        self._after_recalculate([ctrl])
         self.async_update_listeners()
 
+    async def async_recalculate_rooms(self, room_ids: Iterable[str] | None = None) -> None:
+        """Recompute rooms concurrently with one switch batch and one listener flush."""
+        if room_ids is None:
+            ctrls = list(self.controllers.values())
+        else:
+            ctrls = [self.controllers[room_id] for room_id in room_ids if room_id in self.controllers]
+        await self._async_recalculate_batch(ctrls)
+        self.async_update_listeners()
+
+    async def _async_recalculate_batch(self, ctrls: list[RoomController]) -> None:
+        if self._pending_switches is not None:
+            # A batch is already collecting; its owner dispatches our requests too.
+            await asyncio.gather(*(ctrl.async_recalculate_and_control() for ctrl in ctrls))
+            self._after_recalculate(ctrls)
+            return
+        batch: dict[str, bool] = {}
+        self._pending_switches = batch
+        try:
+            results = await asyncio.gather(
+                *(ctrl.async_recalculate_and_control() for ctrl in ctrls), return_exceptions=True
+            )
+            self._after_recalculate(ctrls)
+            # Stop collecting before dispatching; a batch started meanwhile collects its own.
+            self._pending_switches = None
+            await self._async_dispatch_switches(batch)
+        except BaseException:
+            # Nothing else will confirm or abandon what this batch queued.
+            for room_id in batch:
+                self.controllers[room_id].abandon_switch()
+            raise
+        finally:
+            if self._pending_switches is batch:
+                self._pending_switches = None
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    def _after_recalculate(self, ctrls: list[RoomController]) -> None:
+        self._stagger_phases(ctrls)
+        if self.telemetry is not None:
+            self._export(ctrls)
+
+    def _export(self, ctrls: list[RoomController]) -> None:
+        """Queue one record per room that completed a recalculation since the last export."""
+        now = utcnow()
+        for ctrl in ctrls:
+            if self._exported.get(ctrl.room_id) is ctrl.debug or ctrl.debug["final_setpoint"] is None:
+                continue
+            self._exported[ctrl.room_id] = ctrl.debug
+            self.telemetry.record(now, ctrl.room_id, {**ctrl.debug, "is_heating": ctrl.is_heating})
+
+    def _stagger_phases(self, ctrls: Iterable[RoomController]) -> None:
+        """Re-place the PWM windows of rooms whose duty moved, per manifold and period.
+
+        Rooms without a manifold are treated as sharing one heat source. New
+        phases take effect from each room's next period start.
+        """
+        for ctrl in ctrls:
+            group = (ctrl.manifold, ctrl.cfg[CONF_PWM_PERIOD_MINUTES]) if ctrl.pwm_enabled else None
+            previous = self._phase_groups.get(ctrl.room_id)
+            if previous is not None and previous != group:
+                self._planners[previous].remove(ctrl.room_id)
+                del self._phase_groups[ctrl.room_id]
+            if group is None:
+                ctrl.pwm_phase = 0.0
+                continue
+            planner = self._planners.setdefault(group, PhasePlanner())
+            planner.update(ctrl.room_id, ctrl.duty_cycle, ctrl.cfg[CONF_HEATER_POWER_W] or 1.0)
+            self._phase_groups[ctrl.room_id] = group
+            ctrl.pwm_phase = planner.phase(ctrl.room_id)
+
     async def _async_update_data(self) -> dict[str, Any]:
-        for ctrl in self.controllers.values():
-            await ctrl.async_recalculate_and_control()
+        if self._deferred_switches is None:
+            # Weather integrations may still be loading during boot.
+            await self.forecasts.async_refresh(
+                {
+                    ctrl.cfg[CONF_WEATHER_ENTITY]
+                    for ctrl in self.controllers.values()
+                    if ctrl.cfg[CONF_ENABLE_FORECAST]
+                }
+            )
+        if self.thermal is not None:
+            self._step_thermal()
+        await self._async_recalculate_batch(list(self.controllers.values()))
+        if any(ctrl.is_heating for ctrl in self.controllers.values()):
+            # Keep a running interval covered by the shutdown write.
+            self._energy_store.async_delay_save(self._energy_data, ENERGY_SAVE_DELAY_SECONDS)
         return {
             room_id: {
                 "final_setpoint": ctrl.computed_final_setpoint,
@@ -0,0 +1,88 @@
+"""Heater on-time and energy accounting for SmartFloorHeat."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util.dt import as_local, as_utc
+
+DAILY_ROLLUP_DAYS = 62
+MONTHLY_ROLLUP_MONTHS = 24
+
+
+class EnergyMeter:
+    """Integrates heater on-time at switch transitions.
+
+    Totals only move when the heater switches (or at a checkpoint), so there is
+    no sampling. Daily and monthly rollups map local ``YYYY-MM-DD`` / ``YYYY-MM``
+    keys to ``[hours, kwh]`` and are capped in length.
+    """
+
+    def __init__(self) -> None:
+        self.on_hours = 0.0
+        self.kwh = 0.0
+        self.on_since: datetime | None = None
+        self.daily: dict[str, list[float]] = {}
+        self.monthly: dict[str, list[float]] = {}
+
+    def switched(self, on: bool, now: datetime, power_w: float) -> None:
+        if on and self.on_since is None:
+            self.on_since = now
+        elif not on and self.on_since is not None:
+            self._commit(self.on_since, now, power_w)
+            self.on_since = None
+
+    def checkpoint(self, now: datetime, power_w: float) -> None:
+        """Fold a running interval into the totals, e.g. before persisting."""
+        if self.on_since is not None:
+            self._commit(self.on_since, now, power_w)
+            self.on_since = now
+
+    def _commit(self, start: datetime, end: datetime, power_w: float) -> None:
+        local = as_local(start)
+        local_end = as_local(end)
+        while local < local_end:
+            midnight = (local + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+            part_end = min(midnight, local_end)
+            hours = (as_utc(part_end) - as_utc(local)).total_seconds() / 3600
+            kwh = hours * power_w / 1000
+            self.on_hours += hours
+            self.kwh += kwh
+            self._roll(self.daily, local.strftime("%Y-%m-%d"), hours, kwh, DAILY_ROLLUP_DAYS)
+            self._roll(self.monthly, local.strftime("%Y-%m"), hours, kwh, MONTHLY_ROLLUP_MONTHS)
+            local = part_end
+
+    @staticmethod
+    def _roll(rollup: dict[str, list[float]], key: str, hours: float, kwh: float, keep: int) -> None:
+        bucket = rollup.setdefault(key, [0.0, 0.0])
+        bucket[0] += hours
+        bucket[1] += kwh
+        while len(rollup) > keep:
+            del rollup[next(iter(rollup))]
+
+    def total_hours(self, now: datetime) -> float:
+        if self.on_since is None:
+            return self.on_hours
+        return self.on_hours + (now - self.on_since).total_seconds() / 3600
+
+    def total_kwh(self, now: datetime, power_w: float) -> float:
+        if self.on_since is None:
+            return self.kwh
+        return self.kwh + (now - self.on_since).total_seconds() / 3600 * power_w / 1000
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "on_hours": self.on_hours,
+            "kwh": self.kwh,
+            "daily": self.daily,
+            "monthly": self.monthly,
+        }
+
+    def restore(self, data: dict[str, Any] | None) -> None:
+        if not data:
+            return
+        self.on_hours = float(data.get("on_hours", 0.0))
+        self.kwh = float(data.get("kwh", 0.0))
+        self.daily = {key: list(value) for key, value in data.get("daily", {}).items()}
+        self.monthly = {key: list(value) for key, value in data.get("monthly", {}).items()}
@@ -0,0 +1,102 @@
+"""Streaming input filters for SmartFloorHeat."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import deque
+from datetime import datetime
+
+HAMPEL_WINDOW = 9
+HAMPEL_K = 3.0
+MAD_SCALE = 1.4826
+MIN_DEVIATION_DEGC = 0.5
+
+REJECT_STALE = "stale"
+REJECT_RATE = "rate"
+REJECT_OUTLIER = "outlier"
+
+
+class SampleFilter:
+    """Rate-of-change limit plus Hampel outlier rejection for one input.
+
+    The Hampel window has a fixed size, so the sorted copy used for the
+    median is kept with bisect and every sample costs constant time.
+    Samples are keyed on their report time: reading the same report again
+    returns the first verdict without touching the window or counters.
+    """
+
+    def __init__(self, window: int = HAMPEL_WINDOW) -> None:
+        self._size = window
+        self._window: deque[float] = deque()
+        self._sorted: list[float] = []
+        self.last: tuple[datetime, float] | None = None
+        self.rejected = {REJECT_STALE: 0, REJECT_RATE: 0, REJECT_OUTLIER: 0}
+        self._seen: tuple[datetime, float] | None = None
+        self._verdict = False
+        self._stale_seen: datetime | None = None
+
+    def reject_stale(self, reported: datetime | None = None) -> None:
+        """Count a stale reading, once per report when ``reported`` is given."""
+        if reported is not None:
+            if reported == self._stale_seen:
+                return
+            self._stale_seen = reported
+        self.rejected[REJECT_STALE] += 1
+
+    def accept(self, ts: datetime, value: float, max_rate_cph: float) -> bool:
+        """Return True if ``value``, reported at ``ts``, should enter the sample buffers."""
+        if self._seen == (ts, value):
+            return self._verdict
+        self._seen = (ts, value)
+        self._verdict = self._check(ts, value, max_rate_cph)
+        return self._verdict
+
+    def _check(self, ts: datetime, value: float, max_rate_cph: float) -> bool:
+        if self.last is not None:
+            last_ts, last_value = self.last
+            dt_h = max(0.0, (ts - last_ts).total_seconds() / 3600)
+            if abs(value - last_value) > max_rate_cph * dt_h + MIN_DEVIATION_DEGC:
+                self.rejected[REJECT_RATE] += 1
+                return False
+
+        outlier = self._is_outlier(value)
+        self._push(value)
+        if outlier:
+            self.rejected[REJECT_OUTLIER] += 1
+            return False
+        self.last = (ts, value)
+        return True
+
+    def _is_outlier(self, value: float) -> bool:
+        if len(self._sorted) < 3:
+            return False
+        median = self._median(self._sorted)
+        mad = self._median(sorted(abs(v - median) for v in self._sorted))
+        return abs(value - median) > max(HAMPEL_K * MAD_SCALE * mad, MIN_DEVIATION_DEGC)
+
+    def _push(self, value: float) -> None:
+        # Outliers still enter the window so a genuine level shift is adopted
+        # once it holds the majority.
+        if len(self._window) == self._size:
+            old = self._window.popleft()
+            del self._sorted[bisect_left(self._sorted, old)]
+        self._window.append(value)
+        insort(self._sorted, value)
+
+    @staticmethod
+    def _median(values: list[float]) -> float:
+        mid = len(values) // 2
+        if len(values) % 2:
+            return values[mid]
+        return (values[mid - 1] + values[mid]) / 2
+
+    def reset(self) -> None:
+        self._window.clear()
+        self._sorted.clear()
+        self.last = None
+        self._seen = None
+        self._stale_seen = None
+
+    @property
+    def rejected_total(self) -> int:
+        return sum(self.rejected.values())
@@ -0,0 +1,110 @@
+"""Shared hourly weather forecasts for SmartFloorHeat."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import logging
+import math
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import parse_datetime, utcnow
+
+_LOGGER = logging.getLogger(__name__)
+
+LOOKAHEAD_HOURS = 6
+RETRY_AFTER = timedelta(minutes=15)
+
+
+@dataclass(frozen=True)
+class ForecastPoint:
+    at: datetime
+    temperature: float | None
+    wind_speed: float | None
+    wind_gust_speed: float | None
+
+
+def _float(raw) -> float | None:
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def weighted_lookahead(
+    points: list[ForecastPoint], attr: str, current: float, now: datetime, tau_hours: float
+) -> float:
+    """Blend the current value with the next hours, weighted by exp(-h / tau)."""
+    total = current
+    weight = 1.0
+    for point in points:
+        hours = (point.at - now).total_seconds() / 3600
+        if hours <= 0:
+            continue
+        if hours > LOOKAHEAD_HOURS:
+            break
+        value = getattr(point, attr)
+        if value is None:
+            continue
+        w = math.exp(-hours / max(0.1, tau_hours))
+        total += w * value
+        weight += w
+    return total / weight
+
+
+class ForecastCache:
+    """Hourly forecasts per weather entity, fetched once and shared by all rooms.
+
+    Entries are kept until the next full hour, when providers publish a new
+    hourly forecast; rooms only ever read from the cache.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._points: dict[str, list[ForecastPoint]] = {}
+        self._expires: dict[str, datetime] = {}
+
+    def get(self, entity_id: str) -> list[ForecastPoint]:
+        return self._points.get(entity_id, [])
+
+    async def async_refresh(self, entity_ids: set[str]) -> None:
+        now = utcnow()
+        due = sorted(e for e in entity_ids if e not in self._expires or now >= self._expires[e])
+        if not due:
+            return
+        results = await asyncio.gather(
+            *(self._async_fetch(entity_id) for entity_id in due), return_exceptions=True
+        )
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        for entity_id, result in zip(due, results):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Forecast for %s unavailable: %s", entity_id, result)
+                self._expires[entity_id] = now + RETRY_AFTER
+                continue
+            self._points[entity_id] = result
+            self._expires[entity_id] = next_hour
+
+    async def _async_fetch(self, entity_id: str) -> list[ForecastPoint]:
+        response = await self.hass.services.async_call(
+            "weather",
+            "get_forecasts",
+            {"entity_id": entity_id, "type": "hourly"},
+            blocking=True,
+            return_response=True,
+        )
+        points = []
+        for item in (response or {}).get(entity_id, {}).get("forecast", []):
+            at = parse_datetime(str(item.get("datetime")))
+            if at is None:
+                continue
+            points.append(
+                ForecastPoint(
+                    at=at,
+                    temperature=_float(item.get("temperature")),
+                    wind_speed=_float(item.get("wind_speed")),
+                    wind_gust_speed=_float(item.get("wind_gust_speed")),
+                )
+            )
+        points.sort(key=lambda point: point.at)
+        return points
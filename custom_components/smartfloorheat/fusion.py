@@ -0,0 +1,87 @@
+"""Incremental fusion of several indoor sensors."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from datetime import datetime
+
+from .const import FUSION_MEAN, FUSION_MIN
+
+
+def parse_weights(text: str | None) -> list[float]:
+    """Parse a comma separated weight list such as ``"1, 1, 0.5"``."""
+    if not text:
+        return []
+    weights = [float(part) for part in text.split(",") if part.strip()]
+    if any(w < 0 for w in weights):
+        raise ValueError("negative weight")
+    return weights
+
+
+class SensorFusion:
+    """Combine the latest value of each source by weighted mean, median or min.
+
+    Each update only removes the source's previous contribution and adds the
+    new one, so the fused value never rescans all sources.
+    """
+
+    def __init__(self, sources: list[str], weights: list[float], method: str) -> None:
+        self.method = method
+        self._weights = {
+            entity_id: weights[i] if i < len(weights) else 1.0
+            for i, entity_id in enumerate(sources)
+        }
+        self._values: dict[str, tuple[float, datetime]] = {}
+        self._sorted: list[float] = []
+        self._sum_w = 0.0
+        self._sum_wx = 0.0
+
+    def __contains__(self, entity_id: str) -> bool:
+        return entity_id in self._weights
+
+    @property
+    def sources(self) -> list[str]:
+        return list(self._weights)
+
+    def update(self, entity_id: str, value: float | None, reported: datetime | None) -> None:
+        old = self._values.pop(entity_id, None)
+        weight = self._weights[entity_id]
+        if old is not None:
+            del self._sorted[bisect_left(self._sorted, old[0])]
+            self._sum_w -= weight
+            self._sum_wx -= weight * old[0]
+        if value is None or reported is None:
+            return
+        self._values[entity_id] = (value, reported)
+        insort(self._sorted, value)
+        self._sum_w += weight
+        self._sum_wx += weight * value
+
+    def reported_at(self, entity_id: str) -> datetime | None:
+        current = self._values.get(entity_id)
+        return current[1] if current is not None else None
+
+    def expire(self, cutoff: datetime) -> int:
+        """Drop sources not reported since ``cutoff``; returns how many."""
+        stale = [entity_id for entity_id, (_, ts) in self._values.items() if ts < cutoff]
+        for entity_id in stale:
+            self.update(entity_id, None, None)
+        return len(stale)
+
+    @property
+    def reported(self) -> datetime | None:
+        """Latest report time among the current sources."""
+        return max((ts for _, ts in self._values.values()), default=None)
+
+    @property
+    def value(self) -> float | None:
+        if not self._sorted:
+            return None
+        if self.method == FUSION_MIN:
+            return self._sorted[0]
+        if self.method == FUSION_MEAN and self._sum_w > 0:
+            return self._sum_wx / self._sum_w
+        mid = len(self._sorted) // 2
+        if len(self._sorted) % 2:
+            return self._sorted[mid]
+        return (self._sorted[mid - 1] + self._sorted[mid]) / 2
@@ -0,0 +1,92 @@
+"""PI duty-cycle control for SmartFloorHeat."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+
+class PIController:
+    """PI controller producing a duty cycle in [0, 1].
+
+    Anti-windup is done by conditional integration: the integral only moves
+    when the output is not saturated in the direction of the error, and it is
+    held entirely while heating is externally suspended.
+    """
+
+    def __init__(self) -> None:
+        self.integral = 0.0
+        self._last_ts: datetime | None = None
+
+    def update(self, error: float, now: datetime, kp: float, ki: float, hold: bool = False) -> float:
+        dt_h = 0.0
+        if self._last_ts is not None:
+            dt_h = max(0.0, (now - self._last_ts).total_seconds() / 3600)
+        self._last_ts = now
+
+        proportional = kp * error
+        if not hold:
+            candidate = self.integral + ki * error * dt_h
+            unclamped = proportional + candidate
+            saturated_high = unclamped > 1.0 and error > 0
+            saturated_low = unclamped < 0.0 and error < 0
+            if not (saturated_high or saturated_low):
+                self.integral = max(0.0, min(1.0, candidate))
+        return max(0.0, min(1.0, proportional + self.integral))
+
+    def reset(self) -> None:
+        self.integral = 0.0
+        self._last_ts = None
+
+
+PHASE_SLOTS = 24
+
+
+class PhasePlanner:
+    """Staggers the PWM on-windows of rooms sharing a heat source.
+
+    The period is split into ``slots``; each room occupies a contiguous,
+    wrapping run of slots sized by its duty and weighted by its heater power.
+    Rooms are placed greedily where the resulting peak load (then the spread)
+    is lowest. Only rooms whose quantised duty changes are moved, so the
+    phases of the other rooms stay put.
+    """
+
+    def __init__(self, slots: int = PHASE_SLOTS) -> None:
+        self.slots = slots
+        self._load = [0.0] * slots
+        self._rooms: dict[str, tuple[int, float, int]] = {}
+
+    def _add(self, length: int, weight: float, start: int, sign: float) -> None:
+        for offset in range(length):
+            self._load[(start + offset) % self.slots] += sign * weight
+
+    def _score(self, length: int, weight: float, start: int) -> tuple[float, float]:
+        load = list(self._load)
+        for offset in range(length):
+            load[(start + offset) % self.slots] += weight
+        return max(load), sum(value * value for value in load)
+
+    def update(self, room_id: str, duty: float, weight: float) -> None:
+        length = max(0, min(self.slots, round(duty * self.slots)))
+        previous = self._rooms.get(room_id)
+        if previous is not None:
+            if previous[:2] == (length, weight):
+                return
+            self._add(*previous, -1.0)
+        # Try the current start first so ties keep the room where it is.
+        start = previous[2] if previous is not None else 0
+        if 0 < length < self.slots:
+            candidates = [start, *(s for s in range(self.slots) if s != start)]
+            start = min(candidates, key=lambda s: self._score(length, weight, s))
+        self._rooms[room_id] = (length, weight, start)
+        self._add(length, weight, start, 1.0)
+
+    def remove(self, room_id: str) -> None:
+        previous = self._rooms.pop(room_id, None)
+        if previous is not None:
+            self._add(*previous, -1.0)
+
+    def phase(self, room_id: str) -> float:
+        """Start of the room's on-window as a fraction of the period."""
+        room = self._rooms.get(room_id)
+        return room[2] / self.slots if room is not None else 0.0
@@ -0,0 +1,80 @@
+"""Multi-horizon sample buffers for SmartFloorHeat."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+COMPACT_MIN_DROPPED = 64
+
+
+class SampleWindow:
+    """Time-ordered samples shared by several look-back horizons.
+
+    Each horizon keeps the index of its oldest sample, advanced as samples are
+    appended, so no horizon ever rescans the buffer.
+    Samples older than the longest horizon are compacted away in bulk.
+    """
+
+    def __init__(self, horizons: dict[str, timedelta]) -> None:
+        self._ts: list[datetime] = []
+        self._values: list[float] = []
+        self._horizons: dict[str, timedelta] = {}
+        self._start: dict[str, int] = {}
+        self.set_horizons(horizons)
+
+    def set_horizons(self, horizons: dict[str, timedelta]) -> None:
+        """Replace the horizons, keeping the samples already collected."""
+        self._horizons = dict(horizons)
+        self._start = {name: 0 for name in horizons}
+        if self._ts:
+            self._advance(self._ts[-1])
+        self._compact()
+
+    def append(self, ts: datetime, value: float) -> None:
+        self._ts.append(ts)
+        self._values.append(value)
+        self._advance(ts)
+        self._compact()
+
+    def _advance(self, now: datetime) -> None:
+        for name, span in self._horizons.items():
+            cutoff = now - span
+            idx = self._start[name]
+            while self._ts[idx] < cutoff:
+                idx += 1
+            self._start[name] = idx
+
+    def _compact(self) -> None:
+        head = min(self._start.values(), default=len(self._ts))
+        if head < COMPACT_MIN_DROPPED or head * 2 < len(self._ts):
+            return
+        del self._ts[:head]
+        del self._values[:head]
+        for name in self._horizons:
+            self._start[name] -= head
+
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def count(self, horizon: str) -> int:
+        return len(self._ts) - self._start[horizon]
+
+    def change(self, horizon: str) -> float:
+        """Latest minus oldest value within the horizon."""
+        if self.count(horizon) < 2:
+            return 0.0
+        return self._values[-1] - self._values[self._start[horizon]]
+
+    def slope_cph(self, horizon: str) -> float:
+        if self.count(horizon) < 2:
+            return 0.0
+        idx = self._start[horizon]
+        dt_h = (self._ts[-1] - self._ts[idx]).total_seconds() / 3600
+        if dt_h <= 0:
+            return 0.0
+        return (self._values[-1] - self._values[idx]) / dt_h
+
+    def clear(self) -> None:
+        self._ts.clear()
+        self._values.clear()
+        self._start = {name: 0 for name in self._horizons}
@@ -0,0 +1,80 @@
+"""Weekly mode schedules for SmartFloorHeat."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from .const import MODE_AWAY, MODE_COMFORT, MODE_ECO
+
+DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+SCHEDULE_MODES = (MODE_COMFORT, MODE_ECO, MODE_AWAY)
+
+
+def _parse_days(spec: str) -> list[int]:
+    if spec == "daily":
+        return list(range(7))
+    days: list[int] = []
+    for part in spec.split(","):
+        if "-" in part:
+            first, last = (DAYS.index(d) for d in part.split("-", 1))
+            # Ranges such as ``sat-mon`` wrap over the end of the week.
+            days.extend(day % 7 for day in range(first, last + 1 + (7 if last < first else 0)))
+        else:
+            days.append(DAYS.index(part))
+    return days
+
+
+class WeeklySchedule:
+    """Sorted table of (minute of week, mode) transitions.
+
+    Text form is one rule per line or ``;``-separated, e.g.
+    ``mon-fri 06:30 comfort; mon-fri 08:00 eco; sat,sun 08:00 comfort; daily 22:30 eco``.
+    """
+
+    def __init__(self, transitions: list[tuple[int, str]]) -> None:
+        transitions = sorted(dict(transitions).items())
+        self._minutes = [minute for minute, _ in transitions]
+        self._modes = [mode for _, mode in transitions]
+
+    @classmethod
+    def parse(cls, text: str | None) -> WeeklySchedule | None:
+        """Compile schedule text; returns None when empty and raises ValueError when invalid."""
+        if not text or not text.strip():
+            return None
+        transitions: list[tuple[int, str]] = []
+        for rule in text.replace("\n", ";").split(";"):
+            if not rule.strip():
+                continue
+            days, clock, mode = rule.lower().split()
+            hour, minute = (int(part) for part in clock.split(":"))
+            if not (0 <= hour < 24 and 0 <= minute < 60) or mode not in SCHEDULE_MODES:
+                raise ValueError(f"invalid schedule rule: {rule.strip()}")
+            transitions.extend(
+                (day * MINUTES_PER_DAY + hour * 60 + minute, mode) for day in _parse_days(days)
+            )
+        if not transitions:
+            raise ValueError("schedule has no transitions")
+        return cls(transitions)
+
+    @staticmethod
+    def _minute_of_week(local: datetime) -> int:
+        return local.weekday() * MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+    def mode_at(self, local: datetime) -> str:
+        """Mode in force at ``local``; the last rule of the week wraps around."""
+        idx = bisect_right(self._minutes, self._minute_of_week(local)) - 1
+        return self._modes[idx]
+
+    def next_transition(self, local: datetime) -> tuple[datetime, str]:
+        """First transition strictly after ``local``."""
+        now_minute = self._minute_of_week(local)
+        idx = bisect_right(self._minutes, now_minute)
+        ahead = 0
+        if idx == len(self._minutes):
+            idx, ahead = 0, MINUTES_PER_WEEK
+        delta = self._minutes[idx] + ahead - now_minute
+        start = local.replace(second=0, microsecond=0)
+        return start + timedelta(minutes=delta), self._modes[idx]
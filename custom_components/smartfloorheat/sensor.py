@@ -4,9 +4,14 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import PERCENTAGE, UnitOfEnergy, UnitOfTemperature, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
@@ -28,6 +33,33 @@ DESCRIPTIONS = [
     RoomSensorDescription(key="offset_total", key_fn="offset_total", native_unit_of_measurement=UnitOfTemperature.CELSIUS),
     RoomSensorDescription(key="trend_cph", key_fn="trend_cph"),
     RoomSensorDescription(key="outdoor_drop_gain", key_fn="outdoor_drop_gain"),
+    RoomSensorDescription(key="rejected_samples", key_fn="rejected_samples"),
+    RoomSensorDescription(
+        key="memo_hit_ratio",
+        key_fn="memo_hit_ratio",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    RoomSensorDescription(
+        key="duty_cycle",
+        key_fn="duty_cycle",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+    ),
+    RoomSensorDescription(
+        key="energy",
+        key_fn="energy",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+    ),
+    RoomSensorDescription(
+        key="heating_time",
+        key_fn="heating_time",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+    ),
     RoomSensorDescription(key="debug_json", key_fn="debug_json"),
 ]
 
@@ -38,16 +70,20 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     coordinator: SmartFloorHeatCoordinator = hass.data[DOMAIN][entry.entry_id]
-    entities: list[SmartFloorHeatRoomSensor] = []
+    entities: list[SensorEntity] = []
     for room_id in coordinator.controllers:
         for desc in DESCRIPTIONS:
             entities.append(SmartFloorHeatRoomSensor(coordinator, room_id, desc))
+    if coordinator.telemetry is not None:
+        entities.append(SmartFloorHeatTelemetrySensor(coordinator, entry))
     async_add_entities(entities)
 
 
 class SmartFloorHeatRoomSensor(CoordinatorEntity[SmartFloorHeatCoordinator], SensorEntity):
     """Simple room sensor."""
 
+    _unrecorded_attributes = frozenset({"daily", "monthly"})
+
     def __init__(self, coordinator: SmartFloorHeatCoordinator, room_id: str, description: RoomSensorDescription) -> None:
         super().__init__(coordinator)
         self.entity_description = description
@@ -73,6 +109,48 @@ class SmartFloorHeatRoomSensor(CoordinatorEntity[SmartFloorHeatCoordinator], Sen
             return round(self.controller.trend_cph, 3)
         if key == "outdoor_drop_gain":
             return round(self.controller.outdoor_drop_gain, 3)
+        if key == "rejected_samples":
+            return self.controller.indoor_filter.rejected_total + self.controller.outdoor_filter.rejected_total
+        if key == "memo_hit_ratio":
+            ratio = self.controller.memo_hit_ratio
+            return round(ratio * 100, 1) if ratio is not None else None
+        if key == "duty_cycle":
+            return round(self.controller.duty_cycle * 100, 1) if self.controller.pwm_enabled else None
+        if key == "energy":
+            return round(self.controller.energy_kwh, 3)
+        if key == "heating_time":
+            return round(self.controller.heating_hours, 3)
         if key == "debug_json":
             return self.controller.debug_json
         return None
+
+    @property
+    def extra_state_attributes(self):
+        key = self.entity_description.key_fn
+        if key not in ("energy", "heating_time"):
+            return None
+        idx = 1 if key == "energy" else 0
+        energy = self.controller.energy
+        return {
+            "daily": {day: round(bucket[idx], 3) for day, bucket in energy.daily.items()},
+            "monthly": {month: round(bucket[idx], 3) for month, bucket in energy.monthly.items()},
+        }
+
+
+class SmartFloorHeatTelemetrySensor(CoordinatorEntity[SmartFloorHeatCoordinator], SensorEntity):
+    """Records dropped by the telemetry exporter, with its other counters as attributes."""
+
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(self, coordinator: SmartFloorHeatCoordinator, entry: ConfigEntry) -> None:
+        super().__init__(coordinator)
+        self._attr_unique_id = f"smartfloorheat_{entry.entry_id}_telemetry_dropped"
+        self._attr_name = "SmartFloorHeat telemetry_dropped"
+
+    @property
+    def native_value(self) -> int:
+        return self.coordinator.telemetry.dropped
+
+    @property
+    def extra_state_attributes(self):
+        return self.coordinator.telemetry.stats
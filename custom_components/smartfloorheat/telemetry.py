@@ -0,0 +1,196 @@
+"""Batched export of per-room control records for SmartFloorHeat."""
+
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import socket
+from typing import Any, Callable
+from urllib.parse import urlsplit
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    CONF_TELEMETRY_FORMAT,
+    CONF_TELEMETRY_MAX_MB,
+    CONF_TELEMETRY_TARGET,
+    DOMAIN,
+    TELEMETRY_JSONL,
+    TELEMETRY_LINE_PROTOCOL,
+    TELEMETRY_OFF,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+BUFFER_RECORDS = 10_000
+DEFAULT_MAX_MB = 10
+FLUSH_BATCH_RECORDS = 500
+FLUSH_INTERVAL = timedelta(seconds=30)
+ROTATE_BACKUPS = 3
+UDP_DATAGRAM_BYTES = 1400
+MEASUREMENT = DOMAIN
+
+
+def telemetry_options(options: dict[str, Any]) -> dict[str, Any]:
+    """The entry options that configure the exporter."""
+    return {
+        key: options.get(key)
+        for key in (CONF_TELEMETRY_FORMAT, CONF_TELEMETRY_TARGET, CONF_TELEMETRY_MAX_MB)
+    }
+
+
+def _escape_tag(value: str) -> str:
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def _field(value: Any) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return repr(float(value))
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def format_line_protocol(ts: datetime, room_id: str, fields: dict[str, Any]) -> str | None:
+    """One InfluxDB line-protocol line; None when no field has a value."""
+    parts = [
+        f"{_escape_tag(key)}={value}"
+        for key, raw in fields.items()
+        if (value := _field(raw)) is not None
+    ]
+    if not parts:
+        return None
+    return f"{MEASUREMENT},room={_escape_tag(room_id)} {','.join(parts)} {int(ts.timestamp() * 1e9)}"
+
+
+def format_jsonl(ts: datetime, room_id: str, fields: dict[str, Any]) -> str:
+    return json.dumps({"ts": ts.isoformat(), "room": room_id, **fields}, separators=(",", ":"))
+
+
+class TelemetryExporter:
+    """Buffers control records in memory and writes them out in executor batches.
+
+    The buffer is a bounded deque: when it is full the oldest record is
+    evicted and counted in ``dropped``. Records in a batch that fails to
+    write are counted there as well. The target is a file path, rotated by
+    size, or ``udp://host:port``.
+    """
+
+    def __init__(self, hass: HomeAssistant, fmt: str, target: str, max_bytes: int) -> None:
+        self.hass = hass
+        self.format = fmt
+        self.target = target
+        self.max_bytes = max_bytes
+        self.buffer: deque[str] = deque(maxlen=BUFFER_RECORDS)
+        self.written = 0
+        self.dropped = 0
+        self.write_errors = 0
+        self._flushing = False
+        self._unsub: Callable[[], None] | None = None
+        self._udp: tuple[str, int] | None = None
+        if target.startswith("udp://"):
+            parts = urlsplit(target)
+            self._udp = (parts.hostname or "127.0.0.1", parts.port or 8089)
+
+    @classmethod
+    def from_options(cls, hass: HomeAssistant, options: dict[str, Any]) -> TelemetryExporter | None:
+        fmt = options.get(CONF_TELEMETRY_FORMAT) or TELEMETRY_OFF
+        if fmt == TELEMETRY_OFF:
+            return None
+        suffix = "jsonl" if fmt == TELEMETRY_JSONL else "lp"
+        target = options.get(CONF_TELEMETRY_TARGET) or hass.config.path(f"{DOMAIN}_telemetry.{suffix}")
+        max_bytes = int(float(options.get(CONF_TELEMETRY_MAX_MB) or DEFAULT_MAX_MB) * 1024 * 1024)
+        return cls(hass, fmt, target, max_bytes)
+
+    def start(self) -> None:
+        self._unsub = async_track_time_interval(self.hass, self._async_interval_flush, FLUSH_INTERVAL)
+
+    async def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        await self.async_flush()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "buffered": len(self.buffer),
+            "write_errors": self.write_errors,
+            "target": self.target,
+        }
+
+    def record(self, ts: datetime, room_id: str, fields: dict[str, Any]) -> None:
+        if self.format == TELEMETRY_LINE_PROTOCOL:
+            line = format_line_protocol(ts, room_id, fields)
+            if line is None:
+                return
+        else:
+            line = format_jsonl(ts, room_id, fields)
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        self.buffer.append(line)
+        if len(self.buffer) >= FLUSH_BATCH_RECORDS and not self._flushing:
+            self.hass.async_create_task(self.async_flush())
+
+    async def _async_interval_flush(self, _now: datetime) -> None:
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        if self._flushing or not self.buffer:
+            return
+        self._flushing = True
+        lines = list(self.buffer)
+        self.buffer.clear()
+        try:
+            await self.hass.async_add_executor_job(self._write, lines)
+        except OSError as err:
+            self.write_errors += 1
+            self.dropped += len(lines)
+            _LOGGER.warning("Telemetry export to %s failed: %s", self.target, err)
+        else:
+            self.written += len(lines)
+        finally:
+            self._flushing = False
+
+    def _write(self, lines: list[str]) -> None:
+        if self._udp is not None:
+            self._send_udp(lines)
+            return
+        payload = ("\n".join(lines) + "\n").encode()
+        try:
+            size = os.path.getsize(self.target)
+        except FileNotFoundError:
+            size = 0
+        if size and size + len(payload) > self.max_bytes:
+            self._rotate()
+        with open(self.target, "ab") as file:
+            file.write(payload)
+
+    def _rotate(self) -> None:
+        for index in range(ROTATE_BACKUPS - 1, 0, -1):
+            older = f"{self.target}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.target}.{index + 1}")
+        os.replace(self.target, f"{self.target}.1")
+
+    def _send_udp(self, lines: list[str]) -> None:
+        """Pack lines into datagrams below a typical MTU."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            datagram = b""
+            for line in lines:
+                encoded = line.encode() + b"\n"
+                if datagram and len(datagram) + len(encoded) > UDP_DATAGRAM_BYTES:
+                    sock.sendto(datagram, self._udp)
+                    datagram = b""
+                datagram += encoded
+            if datagram:
+                sock.sendto(datagram, self._udp)
@@ -0,0 +1,123 @@
+"""Coupled multi-room thermal model for SmartFloorHeat."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+FORGETTING = 0.995
+INITIAL_COVARIANCE = 100.0
+MAX_COVARIANCE = 1000.0
+INITIAL_LOSS_PER_H = 0.05
+INITIAL_HEATING_CPH = 0.5
+MIN_UPDATES = 12
+MAX_DT_H = 2.0
+MAX_PREDICTED_CHANGE = 2.0
+
+
+class ThermalModel:
+    """First-order room network identified online by recursive least squares.
+
+    Per room ``i`` and hour::
+
+        dT_i/dt = a_i (T_out - T_i) + sum_j k_ij (T_j - T_i) + b_i u_i
+
+    where ``j`` runs over the adjacent rooms and ``u_i`` is the fraction of
+    the interval the room heated. Neighbours are gathered through a padded
+    index array, so a step over all rooms is a handful of array operations
+    of size rooms x max-degree rather than a dense rooms x rooms product.
+    Parameters are estimated per room in one batched RLS update and kept
+    non-negative. Rooms without neighbours get no predictions.
+    """
+
+    def __init__(self, room_ids: Sequence[str], adjacency: Mapping[str, Sequence[str]]) -> None:
+        self.room_ids = list(room_ids)
+        index = {room_id: i for i, room_id in enumerate(self.room_ids)}
+        neighbours: list[set[int]] = [set() for _ in self.room_ids]
+        for room_id, adjacent in adjacency.items():
+            for other in adjacent:
+                if room_id in index and other in index and other != room_id:
+                    neighbours[index[room_id]].add(index[other])
+                    neighbours[index[other]].add(index[room_id])
+
+        n = len(self.room_ids)
+        degree = max((len(nbrs) for nbrs in neighbours), default=0)
+        self._nbr = np.zeros((n, degree), dtype=int)
+        self._nbr_mask = np.zeros((n, degree))
+        for i, nbrs in enumerate(neighbours):
+            for slot, j in enumerate(sorted(nbrs)):
+                self._nbr[i, slot] = j
+                self._nbr_mask[i, slot] = 1.0
+        self.coupled = self._nbr_mask.any(axis=1)
+
+        # Feature layout: [T_out - T_i, (T_j - T_i) per neighbour slot, u_i].
+        dim = degree + 2
+        self.theta = np.zeros((n, dim))
+        self.theta[:, 0] = INITIAL_LOSS_PER_H
+        self.theta[:, -1] = INITIAL_HEATING_CPH
+        # Padded neighbour slots get zero covariance so they are never estimated.
+        self._cov = np.eye(dim) * INITIAL_COVARIANCE * np.column_stack(
+            (np.ones(n), self._nbr_mask, np.ones(n))
+        )[:, :, None]
+        self.updates = np.zeros(n, dtype=int)
+        self._last: tuple[np.ndarray, np.ndarray] | None = None
+
+    def _features(self, temps: np.ndarray, outdoor: np.ndarray, duty: np.ndarray) -> np.ndarray:
+        neighbour_delta = (temps[self._nbr] - temps[:, None]) * self._nbr_mask
+        return np.column_stack((outdoor - temps, neighbour_delta, duty))
+
+    def _fill(self, temps: np.ndarray, outdoor: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Replace missing readings so they contribute no heat flow."""
+        valid = ~np.isnan(temps)
+        temps = np.where(valid, temps, np.nanmean(temps) if valid.any() else 0.0)
+        outdoor = np.where(np.isnan(outdoor), temps, outdoor)
+        return temps, outdoor
+
+    def observe(self, temps: np.ndarray, outdoor: np.ndarray, duty: np.ndarray, dt_h: float) -> None:
+        """Fit the interval that just ended, given the readings at its end.
+
+        ``temps`` and ``outdoor`` use NaN for missing readings; ``duty`` is
+        the fraction of the interval each room heated.
+        """
+        if self._last is not None and 0 < dt_h <= MAX_DT_H:
+            prev_temps, prev_outdoor = self._last
+            valid = ~np.isnan(prev_temps) & ~np.isnan(temps) & ~np.isnan(prev_outdoor)
+            valid &= np.all(~np.isnan(prev_temps[self._nbr]) | (self._nbr_mask == 0), axis=1)
+            if valid.any():
+                filled_temps, filled_outdoor = self._fill(prev_temps, prev_outdoor)
+                phi = self._features(filled_temps, filled_outdoor, duty)
+                rate = (np.nan_to_num(temps) - filled_temps) / dt_h
+                self._rls(phi, rate, valid)
+        self._last = (temps.copy(), outdoor.copy())
+
+    def _rls(self, phi: np.ndarray, y: np.ndarray, valid: np.ndarray) -> None:
+        cov_phi = np.einsum("nij,nj->ni", self._cov, phi)
+        gain = cov_phi / (FORGETTING + np.einsum("ni,ni->n", phi, cov_phi))[:, None]
+        error = y - np.einsum("ni,ni->n", self.theta, phi)
+        theta = np.maximum(self.theta + gain * error[:, None], 0.0)
+        cov = (self._cov - np.einsum("ni,nj->nij", gain, cov_phi)) / FORGETTING
+        # Bound the covariance so directions that are not excited (a heater
+        # that never switches) cannot wind up under forgetting.
+        peak = np.max(np.diagonal(cov, axis1=1, axis2=2), axis=1)
+        cov *= np.minimum(1.0, MAX_COVARIANCE / np.maximum(peak, 1e-12))[:, None, None]
+        self.theta = np.where(valid[:, None], theta, self.theta)
+        self._cov = np.where(valid[:, None, None], cov, self._cov)
+        self.updates += valid
+
+    def predict(self, temps: np.ndarray, outdoor: np.ndarray, duty: np.ndarray, horizon_h: float) -> np.ndarray:
+        """Temperatures ``horizon_h`` ahead; NaN for rooms that are missing, uncoupled or still learning."""
+        filled_temps, filled_outdoor = self._fill(temps, outdoor)
+        rate = np.einsum("ni,ni->n", self.theta, self._features(filled_temps, filled_outdoor, duty))
+        change = np.clip(rate * horizon_h, -MAX_PREDICTED_CHANGE, MAX_PREDICTED_CHANGE)
+        ready = (self.updates >= MIN_UPDATES) & self.coupled & ~np.isnan(temps)
+        return np.where(ready, filled_temps + change, np.nan)
+
+    def params(self, i: int) -> dict[str, float | None]:
+        loss = float(self.theta[i, 0])
+        return {
+            "tau_h": round(1 / loss, 2) if loss > 0 else None,
+            "coupling_per_h": round(float(self.theta[i, 1:-1] @ self._nbr_mask[i]), 4),
+            "heating_cph": round(float(self.theta[i, -1]), 3),
+            "updates": int(self.updates[i]),
+        }
@@ -0,0 +1,19 @@
+"""Shared fixtures for SmartFloorHeat tests."""
+
+from __future__ import annotations
+
+import pytest
+
+from .fake_hass import FakeHass, install
+
+
+@pytest.fixture
+def make_hass(monkeypatch):
+    """Factory for a fresh fake hass; the controller helpers follow the latest one."""
+
+    def factory() -> FakeHass:
+        fake = FakeHass()
+        install(monkeypatch, fake)
+        return fake
+
+    return factory
@@ -0,0 +1,262 @@
+"""Minimal stand-in for HomeAssistant used by the SmartFloorHeat tests.
+
+Only what the room controller touches is modelled: a state machine that
+fires state-change listeners (an unchanged state only moves
+``last_reported``, as in Home Assistant), a service registry that records calls and
+flips switch states, and a simulated clock that runs point-in-time timers
+in order. Everything is plain Python so thousands of simulated hours run
+per second.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import heapq
+import itertools
+from typing import Any, Awaitable, Callable
+
+from custom_components.smartfloorheat import controllers, coordinator
+from custom_components.smartfloorheat.const import (
+    BASE_SOURCE_VIRTUAL,
+    CONF_BASE_SOURCE_TYPE,
+    CONF_BASE_VIRTUAL_TEMPERATURE,
+    CONF_ENABLE_FORECAST,
+    CONF_ENABLE_WINDOW_DETECTION,
+    CONF_FLOW_TEMP_SENSOR,
+    CONF_HEATER_SWITCH,
+    CONF_INDOOR_TEMP_SENSOR,
+    CONF_MIN_OFF_MINUTES,
+    CONF_MIN_ON_MINUTES,
+    CONF_OUTDOOR_TEMP_SENSOR,
+    CONF_OUTPUT_MODE,
+    CONF_ROOM_ID,
+    CONF_ROOM_NAME,
+    CONF_SOLAR_CURRENT_HOUR,
+    CONF_SOLAR_NEXT_HOUR,
+    CONF_SOLAR_TODAY_REMAINING,
+    CONF_SOLAR_TOMORROW,
+    CONF_WEATHER_ENTITY,
+    DEFAULTS,
+    OUTPUT_HYSTERESIS,
+)
+from custom_components.smartfloorheat.forecast import ForecastPoint
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+INDOOR = "sensor.indoor"
+OUTDOOR = "sensor.outdoor"
+FLOW = "sensor.flow"
+WEATHER = "weather.home"
+HEATER = "switch.heater"
+SOLAR = (
+    "sensor.solar_current_hour",
+    "sensor.solar_next_hour",
+    "sensor.solar_today_remaining",
+    "sensor.solar_tomorrow",
+)
+
+
+@dataclass
+class FakeState:
+    entity_id: str
+    state: str
+    attributes: dict[str, Any]
+    last_updated: datetime
+    last_reported: datetime
+
+
+@dataclass
+class FakeEvent:
+    data: dict[str, Any]
+
+
+class FakeClock:
+    """Simulated UTC clock with a timer heap."""
+
+    def __init__(self, start: datetime = START) -> None:
+        self.now = start
+        self._timers: list[tuple[datetime, int, Callable[[datetime], Awaitable[None]]]] = []
+        self._cancelled: set[int] = set()
+        self._seq = itertools.count()
+
+    def utcnow(self) -> datetime:
+        return self.now
+
+    def call_at(self, when: datetime, action: Callable[[datetime], Awaitable[None]]) -> Callable[[], None]:
+        seq = next(self._seq)
+        heapq.heappush(self._timers, (when, seq, action))
+        return lambda: self._cancelled.add(seq)
+
+    async def advance(self, delta: timedelta) -> None:
+        """Move the clock forward, running due timers at their own time."""
+        target = self.now + delta
+        while self._timers and self._timers[0][0] <= target:
+            when, seq, action = heapq.heappop(self._timers)
+            if seq in self._cancelled:
+                self._cancelled.discard(seq)
+                continue
+            self.now = max(self.now, when)
+            await action(self.now)
+        self.now = target
+
+
+class FakeStates:
+    def __init__(self, clock: FakeClock) -> None:
+        self._clock = clock
+        self._states: dict[str, FakeState] = {}
+        self._listeners: dict[str, list[Callable[[FakeEvent], Awaitable[None]]]] = {}
+
+    def get(self, entity_id: str) -> FakeState | None:
+        return self._states.get(entity_id)
+
+    async def async_set(self, entity_id: str, state: Any, attributes: dict[str, Any] | None = None) -> None:
+        now = self._clock.now
+        old = self._states.get(entity_id)
+        if old is not None and old.state == str(state) and old.attributes == (attributes or {}):
+            old.last_reported = now
+            return
+        new = FakeState(entity_id, str(state), dict(attributes or {}), now, now)
+        self._states[entity_id] = new
+        for listener in list(self._listeners.get(entity_id, ())):
+            await listener(FakeEvent({"entity_id": entity_id, "old_state": old, "new_state": new}))
+
+    def listen(self, entity_ids: list[str], action: Callable[[FakeEvent], Awaitable[None]]) -> Callable[[], None]:
+        for entity_id in entity_ids:
+            self._listeners.setdefault(entity_id, []).append(action)
+
+        def unsub() -> None:
+            for entity_id in entity_ids:
+                self._listeners[entity_id].remove(action)
+
+        return unsub
+
+
+class FakeServices:
+    def __init__(self, states: FakeStates) -> None:
+        self._states = states
+        self.calls: list[tuple[str, str, dict[str, Any]]] = []
+
+    async def async_call(self, domain: str, service: str, data: dict[str, Any], **_kwargs: Any) -> None:
+        self.calls.append((domain, service, data))
+        if domain == "switch" and service in ("turn_on", "turn_off"):
+            entity_ids = data["entity_id"]
+            for entity_id in [entity_ids] if isinstance(entity_ids, str) else entity_ids:
+                await self._states.async_set(entity_id, "on" if service == "turn_on" else "off")
+
+
+class FakeStore:
+    """Stands in for the coordinator's energy Store; nothing is written."""
+
+    def __init__(self, *_args: Any) -> None:
+        self.data: dict[str, Any] | None = None
+        self.delayed_saves = 0
+
+    async def async_load(self) -> dict[str, Any] | None:
+        return self.data
+
+    async def async_save(self, data: dict[str, Any]) -> None:
+        self.data = data
+
+    def async_delay_save(self, _data_func: Callable[[], dict[str, Any]], _delay: float = 0) -> None:
+        self.delayed_saves += 1
+
+
+@dataclass
+class FakeHass:
+    clock: FakeClock = field(default_factory=FakeClock)
+
+    def __post_init__(self) -> None:
+        self.states = FakeStates(self.clock)
+        self.services = FakeServices(self.states)
+        self.data: dict[str, Any] = {}
+
+
+def install(monkeypatch, hass: FakeHass) -> None:
+    """Route the controller's and coordinator's clock, event helpers and storage through ``hass``."""
+    monkeypatch.setattr(controllers, "utcnow", hass.clock.utcnow)
+    monkeypatch.setattr(coordinator, "utcnow", hass.clock.utcnow)
+    monkeypatch.setattr(coordinator, "Store", FakeStore)
+    monkeypatch.setattr(
+        controllers,
+        "async_track_point_in_time",
+        lambda _hass, action, when: hass.clock.call_at(when, action),
+    )
+    monkeypatch.setattr(
+        controllers,
+        "async_track_state_change_event",
+        lambda _hass, entity_ids, action: hass.states.listen(list(entity_ids), action),
+    )
+
+
+def room_cfg(**overrides: Any) -> dict[str, Any]:
+    """A fixed hysteresis room on the fake entities, 21 °C base, no min-on/off.
+
+    Tests override whatever they rely on rather than inheriting it.
+    """
+    return {
+        **DEFAULTS,
+        CONF_ROOM_NAME: "Test",
+        CONF_ROOM_ID: "test",
+        CONF_INDOOR_TEMP_SENSOR: [INDOOR],
+        CONF_HEATER_SWITCH: [HEATER],
+        CONF_WEATHER_ENTITY: WEATHER,
+        CONF_OUTDOOR_TEMP_SENSOR: OUTDOOR,
+        CONF_FLOW_TEMP_SENSOR: FLOW,
+        CONF_SOLAR_CURRENT_HOUR: SOLAR[0],
+        CONF_SOLAR_NEXT_HOUR: SOLAR[1],
+        CONF_SOLAR_TODAY_REMAINING: SOLAR[2],
+        CONF_SOLAR_TOMORROW: SOLAR[3],
+        CONF_BASE_SOURCE_TYPE: BASE_SOURCE_VIRTUAL,
+        CONF_BASE_VIRTUAL_TEMPERATURE: 21.0,
+        CONF_OUTPUT_MODE: OUTPUT_HYSTERESIS,
+        CONF_MIN_ON_MINUTES: 0,
+        CONF_MIN_OFF_MINUTES: 0,
+        CONF_ENABLE_FORECAST: False,
+        CONF_ENABLE_WINDOW_DETECTION: False,
+        **overrides,
+    }
+
+
+class Room:
+    """One RoomController on a fake hass, with a switch log.
+
+    By default switches go straight to the fake service registry and are
+    confirmed, as the coordinator does after a successful call.
+    """
+
+    def __init__(self, hass: FakeHass, cfg: dict[str, Any], switch_callback=None) -> None:
+        self.hass = hass
+        self.switches: list[tuple[datetime, bool]] = []
+        self.forecast: list[ForecastPoint] = []
+        self.ctrl = controllers.RoomController(
+            hass, cfg, self._request, switch_callback or self._switch, lambda _entity_id: self.forecast
+        )
+
+    async def _request(self, _room_id: str) -> None:
+        """Recalculations are driven explicitly by the test."""
+
+    async def _switch(self, ctrl: controllers.RoomController, turn_on: bool) -> None:
+        self.switches.append((self.hass.clock.now, turn_on))
+        await self.hass.services.async_call(
+            "switch", "turn_on" if turn_on else "turn_off", {"entity_id": ctrl.heater_switches}
+        )
+        ctrl.confirm_switch(turn_on, self.hass.clock.now)
+
+    async def set_inputs(
+        self,
+        indoor: float = 20.0,
+        outdoor: float = 5.0,
+        flow: float = 30.0,
+        solar: float = 1.0,
+        wind: float = 5.0,
+    ) -> None:
+        states = self.hass.states
+        await states.async_set(INDOOR, indoor)
+        await states.async_set(OUTDOOR, outdoor)
+        await states.async_set(FLOW, flow)
+        for entity_id in SOLAR:
+            await states.async_set(entity_id, solar)
+        await states.async_set(
+            WEATHER, "cloudy", {"wind_speed": wind, "wind_gust_speed": wind, "temperature": outdoor}
+        )
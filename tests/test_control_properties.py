@@ -0,0 +1,197 @@
+"""Randomised property tests for RoomController.async_recalculate_and_control.
+
+Each example draws a room configuration and drives it through a random
+weather/solar/flow trace on the fake clock. The number of examples is set
+with SMARTFLOORHEAT_FUZZ_EXAMPLES and the seed with SMARTFLOORHEAT_FUZZ_SEED.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import os
+import random
+
+from custom_components.smartfloorheat.const import (
+    CONF_AWAY_SETBACK_C,
+    CONF_BASE_VIRTUAL_TEMPERATURE,
+    CONF_COMFORT_GUARD_DELTA,
+    CONF_ECO_SETBACK_C,
+    CONF_ENABLE_FLOW_GUARD,
+    CONF_ENABLE_FORECAST,
+    CONF_ENABLE_OUTDOOR,
+    CONF_ENABLE_SOLAR,
+    CONF_ENABLE_WIND,
+    CONF_ENABLE_WINDOW_DETECTION,
+    CONF_FLOW_LOW_THRESHOLD,
+    CONF_HYSTERESIS_DEGC,
+    CONF_MAX_COOLING_DEGC,
+    CONF_MAX_OUTDOOR_BOOST_DEGC,
+    CONF_MAX_WIND_BOOST_DEGC,
+    CONF_MIN_OFF_MINUTES,
+    CONF_MIN_ON_MINUTES,
+    CONF_ORIENTATION_FACTOR,
+    CONF_ORIENTATION_MODE,
+    CONF_OUTPUT_MODE,
+    CONF_PWM_KI,
+    CONF_PWM_KP,
+    CONF_PWM_PERIOD_MINUTES,
+    CONF_WIND_EFFECT_PERCENT,
+    MODE_AWAY,
+    MODE_COMFORT,
+    MODE_ECO,
+    ORIENTATION_EAST,
+    ORIENTATION_NORTH,
+    ORIENTATION_SOUTH,
+    ORIENTATION_WEST,
+    OUTPUT_HYSTERESIS,
+    OUTPUT_PWM,
+)
+from custom_components.smartfloorheat.forecast import ForecastPoint
+
+from .fake_hass import FLOW, INDOOR, OUTDOOR, SOLAR, WEATHER, Room, room_cfg
+
+FUZZ_EXAMPLES = int(os.environ.get("SMARTFLOORHEAT_FUZZ_EXAMPLES", "100"))
+FUZZ_SEED = int(os.environ.get("SMARTFLOORHEAT_FUZZ_SEED", "20240101"))
+STEPS = 300
+EPS = 1e-9
+
+
+def _random_cfg(rng: random.Random) -> dict:
+    return room_cfg(
+        **{
+            CONF_BASE_VIRTUAL_TEMPERATURE: rng.uniform(16.0, 24.0),
+            CONF_MAX_COOLING_DEGC: rng.uniform(0.0, 5.0),
+            CONF_MAX_WIND_BOOST_DEGC: rng.uniform(0.0, 3.0),
+            CONF_MAX_OUTDOOR_BOOST_DEGC: rng.uniform(0.0, 3.0),
+            CONF_WIND_EFFECT_PERCENT: rng.uniform(0.0, 200.0),
+            CONF_COMFORT_GUARD_DELTA: rng.uniform(0.05, 1.0),
+            CONF_FLOW_LOW_THRESHOLD: rng.uniform(20.0, 35.0),
+            CONF_ORIENTATION_MODE: rng.choice(
+                (ORIENTATION_NORTH, ORIENTATION_SOUTH, ORIENTATION_EAST, ORIENTATION_WEST)
+            ),
+            CONF_ORIENTATION_FACTOR: rng.choice((None, rng.uniform(0.0, 2.0))),
+            CONF_ECO_SETBACK_C: rng.uniform(0.0, 3.0),
+            CONF_AWAY_SETBACK_C: rng.uniform(0.0, 5.0),
+            CONF_HYSTERESIS_DEGC: rng.uniform(0.05, 1.0),
+            CONF_MIN_ON_MINUTES: rng.randint(0, 30),
+            CONF_MIN_OFF_MINUTES: rng.randint(0, 30),
+            CONF_OUTPUT_MODE: rng.choice((OUTPUT_HYSTERESIS, OUTPUT_PWM)),
+            CONF_PWM_PERIOD_MINUTES: rng.choice((10, 15, 20, 30, 45, 60)),
+            CONF_PWM_KP: rng.uniform(0.0, 2.0),
+            CONF_PWM_KI: rng.uniform(0.0, 2.0),
+            CONF_ENABLE_SOLAR: rng.random() < 0.8,
+            CONF_ENABLE_WIND: rng.random() < 0.8,
+            CONF_ENABLE_OUTDOOR: rng.random() < 0.8,
+            CONF_ENABLE_FLOW_GUARD: rng.random() < 0.8,
+            CONF_ENABLE_FORECAST: rng.random() < 0.5,
+            CONF_ENABLE_WINDOW_DETECTION: rng.random() < 0.5,
+        }
+    )
+
+
+def _random_forecast(rng: random.Random, now: datetime) -> list[ForecastPoint]:
+    return [
+        ForecastPoint(
+            at=now + timedelta(hours=hour),
+            temperature=rng.uniform(-20.0, 20.0),
+            wind_speed=rng.uniform(0.0, 60.0),
+            wind_gust_speed=rng.uniform(0.0, 90.0),
+        )
+        for hour in range(1, 9)
+    ]
+
+
+class Scenario(Room):
+    """A randomly configured room driven through a random trace with a crude thermal model."""
+
+    def __init__(self, hass, rng: random.Random) -> None:
+        super().__init__(hass, _random_cfg(rng))
+        self.rng = rng
+        self.ctrl.async_set_mode(rng.choice((MODE_COMFORT, MODE_ECO, MODE_AWAY)))
+        self.indoor = rng.uniform(14.0, 25.0)
+        self.outdoor = rng.uniform(-15.0, 15.0)
+
+    async def _set_inputs(self) -> None:
+        rng = self.rng
+        states = self.hass.states
+        self.outdoor = max(-25.0, min(25.0, self.outdoor + rng.gauss(0.0, 0.5)))
+        await states.async_set(OUTDOOR, round(self.outdoor, 2) if rng.random() > 0.05 else "unavailable")
+        wind = rng.uniform(0.0, 60.0)
+        await states.async_set(
+            WEATHER,
+            "cloudy",
+            {"wind_speed": wind, "wind_gust_speed": wind + rng.uniform(0.0, 30.0), "temperature": self.outdoor},
+        )
+        for entity_id in SOLAR:
+            await states.async_set(entity_id, round(rng.uniform(0.0, 6.0), 2))
+        await states.async_set(FLOW, round(rng.uniform(18.0, 40.0), 1) if rng.random() > 0.1 else "unknown")
+        await states.async_set(INDOOR, round(self.indoor, 2))
+        if rng.random() < 0.05:
+            self.forecast = _random_forecast(rng, self.hass.clock.now)
+
+    async def run(self, steps: int, check) -> None:
+        await self._set_inputs()
+        await self.ctrl.async_added()
+        for _ in range(steps):
+            minutes = self.rng.choice((1, 2, 5, 10, 15))
+            await self.hass.clock.advance(timedelta(minutes=minutes))
+            rate = 1.0 if self.ctrl.is_heating else -0.4
+            self.indoor += rate * minutes / 60 + self.rng.gauss(0.0, 0.05)
+            if self.rng.random() < 0.01:
+                # Sudden drop, as from an opened window.
+                self.indoor -= self.rng.uniform(0.5, 2.0)
+            await self._set_inputs()
+            previous = self.ctrl.debug
+            await self.ctrl.async_recalculate_and_control()
+            if self.ctrl.debug is not previous:
+                check(self)
+        await self.ctrl.async_will_remove()
+
+
+def _run_examples(make_hass, check, finish=None) -> None:
+    async def main() -> None:
+        rng = random.Random(FUZZ_SEED)
+        for _ in range(FUZZ_EXAMPLES):
+            scenario = Scenario(make_hass(), random.Random(rng.getrandbits(64)))
+            await scenario.run(STEPS, check)
+            if finish is not None:
+                finish(scenario)
+
+    asyncio.run(main())
+
+
+def test_final_setpoint_stays_in_band(make_hass) -> None:
+    def check(scenario: Scenario) -> None:
+        ctrl = scenario.ctrl
+        base = ctrl.base_setpoint - ctrl._setback(ctrl.debug["mode"])
+        assert base - 0.2 - EPS <= ctrl.computed_final_setpoint <= base + 1.0 + EPS
+
+    _run_examples(make_hass, check)
+
+
+def test_min_on_and_min_off_are_respected(make_hass) -> None:
+    def finish(scenario: Scenario) -> None:
+        cfg = scenario.ctrl.cfg
+        min_on = timedelta(minutes=cfg[CONF_MIN_ON_MINUTES])
+        min_off = timedelta(minutes=cfg[CONF_MIN_OFF_MINUTES])
+        for (start, on), (end, next_on) in zip(scenario.switches, scenario.switches[1:]):
+            assert next_on != on
+            assert end - start >= (min_on if on else min_off)
+
+    _run_examples(make_hass, lambda _scenario: None, finish)
+
+
+def test_guards_block_negative_offsets(make_hass) -> None:
+    def check(scenario: Scenario) -> None:
+        ctrl = scenario.ctrl
+        cfg = ctrl.cfg
+        _, indoor = ctrl.indoor_filter.last
+        base = ctrl.base_setpoint - ctrl._setback(ctrl.debug["mode"])
+        flow = ctrl._f(FLOW)
+        comfort_guard = indoor < base - cfg[CONF_COMFORT_GUARD_DELTA]
+        flow_guard = cfg[CONF_ENABLE_FLOW_GUARD] and flow is not None and flow < cfg[CONF_FLOW_LOW_THRESHOLD]
+        if comfort_guard or flow_guard:
+            assert ctrl.current_offsets["total"] >= -0.1 - EPS
+
+    _run_examples(make_hass, check)
@@ -0,0 +1,155 @@
+"""Tests for switch batching in SmartFloorHeatCoordinator."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from custom_components.smartfloorheat.const import (
+    CONF_ECO_SETBACK_C,
+    CONF_HEATER_SWITCH,
+    CONF_INDOOR_TEMP_SENSOR,
+    CONF_ROOM_ID,
+    CONF_ROOM_NAME,
+    CONF_SCHEDULE,
+    MODE_ECO,
+)
+from custom_components.smartfloorheat.coordinator import SmartFloorHeatCoordinator
+
+from .fake_hass import HEATER, Room, room_cfg
+
+INDOOR_B = "sensor.indoor_b"
+HEATER_B = "switch.heater_b"
+
+
+async def _two_rooms(hass) -> SmartFloorHeatCoordinator:
+    cfgs = [
+        room_cfg(**{CONF_ROOM_ID: "a", CONF_ROOM_NAME: "A"}),
+        room_cfg(
+            **{
+                CONF_ROOM_ID: "b",
+                CONF_ROOM_NAME: "B",
+                CONF_INDOOR_TEMP_SENSOR: [INDOOR_B],
+                CONF_HEATER_SWITCH: [HEATER_B],
+            }
+        ),
+    ]
+    await Room(hass, cfgs[0]).set_inputs(indoor=17.0)
+    await hass.states.async_set(INDOOR_B, 17.0)
+    coordinator = SmartFloorHeatCoordinator(hass, cfgs, "entry")
+    await coordinator.async_setup()
+    coordinator._deferred_switches = None
+    return coordinator
+
+
+def test_overlapping_batches_keep_their_own_switches(make_hass) -> None:
+    async def main() -> None:
+        hass = make_hass()
+        coordinator = await _two_rooms(hass)
+        room_b = coordinator.controllers["b"]
+
+        dispatching_a = asyncio.Event()
+        release_a = asyncio.Event()
+        release_b = asyncio.Event()
+        call = hass.services.async_call
+
+        async def slow_call(domain, service, data, **kwargs) -> None:
+            if HEATER in data["entity_id"]:
+                dispatching_a.set()
+                await release_a.wait()
+            await call(domain, service, data, **kwargs)
+
+        hass.services.async_call = slow_call
+        recalculate_b = room_b.async_recalculate_and_control
+
+        async def slow_recalculate_b() -> None:
+            await recalculate_b()
+            await release_b.wait()
+
+        room_b.async_recalculate_and_control = slow_recalculate_b
+
+        # Batch A is dispatching room a's switch when batch B starts collecting.
+        batch_a = asyncio.create_task(coordinator.async_recalculate_rooms(["a"]))
+        await dispatching_a.wait()
+        batch_b = asyncio.create_task(coordinator.async_recalculate_rooms(["b"]))
+        while room_b._switch_pending is None:
+            await asyncio.sleep(0)
+        release_a.set()
+        await batch_a
+        release_b.set()
+        await batch_b
+
+        assert hass.states.get(HEATER).state == "on"
+        assert hass.states.get(HEATER_B).state == "on"
+        assert coordinator.controllers["a"].is_heating
+        assert room_b.is_heating
+        await coordinator.async_unload()
+
+    asyncio.run(main())
+
+
+def test_room_raising_in_a_batch_does_not_strand_queued_switches(make_hass) -> None:
+    async def main() -> None:
+        hass = make_hass()
+        coordinator = await _two_rooms(hass)
+
+        async def broken() -> None:
+            raise RuntimeError("sensor glitch")
+
+        coordinator.controllers["b"].async_recalculate_and_control = broken
+        with pytest.raises(RuntimeError):
+            await coordinator.async_recalculate_rooms()
+
+        room_a = coordinator.controllers["a"]
+        assert room_a.is_heating
+        assert room_a._switch_pending is None
+        assert hass.states.get(HEATER).state == "on"
+        await coordinator.async_unload()
+
+    asyncio.run(main())
+
+
+def test_failed_dispatch_releases_the_room_for_a_retry(make_hass) -> None:
+    async def main() -> None:
+        hass = make_hass()
+        coordinator = await _two_rooms(hass)
+        call = hass.services.async_call
+
+        async def failing_call(domain, service, data, **kwargs) -> None:
+            raise RuntimeError("actuator offline")
+
+        hass.services.async_call = failing_call
+        await coordinator.async_recalculate_rooms(["a"])
+        room_a = coordinator.controllers["a"]
+        assert not room_a.is_heating
+        assert room_a._switch_pending is None
+
+        hass.services.async_call = call
+        await coordinator.async_recalculate_rooms(["a"])
+        assert room_a.is_heating
+        assert hass.states.get(HEATER).state == "on"
+        await coordinator.async_unload()
+
+    asyncio.run(main())
+
+
+def test_boot_time_switching_follows_the_schedule(make_hass) -> None:
+    async def main() -> None:
+        hass = make_hass()
+        cfg = room_cfg(**{CONF_SCHEDULE: "mon-sun 00:00 eco", CONF_ECO_SETBACK_C: 2.0})
+        await Room(hass, cfg).set_inputs(indoor=20.0)
+        coordinator = SmartFloorHeatCoordinator(hass, [cfg], "entry")
+        await coordinator.async_setup()
+        ctrl = coordinator.controllers["test"]
+        assert ctrl.mode == MODE_ECO
+
+        # Before HA has started: decided in eco, so a comfort-warm room stays off.
+        await coordinator.async_recalculate_rooms()
+        assert coordinator._deferred_switches == {}
+        await coordinator.async_start()
+        assert not ctrl.is_heating
+        assert hass.services.calls == []
+        await coordinator.async_unload()
+
+    asyncio.run(main())
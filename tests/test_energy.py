@@ -0,0 +1,91 @@
+"""Tests for heater on-time and energy accounting."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.smartfloorheat.energy import (
+    DAILY_ROLLUP_DAYS,
+    MONTHLY_ROLLUP_MONTHS,
+    EnergyMeter,
+)
+
+POWER_W = 1000.0
+# 23:30 on New Year's Eve in Berlin.
+EVENING = datetime(2023, 12, 31, 22, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def berlin(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(dt_util, "DEFAULT_TIME_ZONE", ZoneInfo("Europe/Berlin"))
+
+
+def test_interval_is_split_at_local_midnight() -> None:
+    meter = EnergyMeter()
+    meter.switched(True, EVENING, POWER_W)
+    meter.switched(False, EVENING + timedelta(hours=2), POWER_W)
+    assert meter.daily == {"2023-12-31": [0.5, 0.5], "2024-01-01": [1.5, 1.5]}
+    assert meter.monthly == {"2023-12": [0.5, 0.5], "2024-01": [1.5, 1.5]}
+    assert meter.on_hours == pytest.approx(2.0)
+    assert meter.kwh == pytest.approx(2.0)
+    assert meter.on_since is None
+
+
+def test_rollups_keep_only_the_newest_buckets() -> None:
+    meter = EnergyMeter()
+    start = EVENING + timedelta(hours=2)
+    for day in range(DAILY_ROLLUP_DAYS + 8):
+        on = start + timedelta(days=day)
+        meter.switched(True, on, POWER_W)
+        meter.switched(False, on + timedelta(hours=1), POWER_W)
+    assert len(meter.daily) == DAILY_ROLLUP_DAYS
+    assert next(iter(meter.daily)) == "2024-01-09"
+    assert meter.on_hours == pytest.approx(DAILY_ROLLUP_DAYS + 8)
+
+    for month in range(MONTHLY_ROLLUP_MONTHS + 2):
+        on = datetime(2024 + month // 12, month % 12 + 1, 15, tzinfo=timezone.utc)
+        meter.switched(True, on, POWER_W)
+        meter.switched(False, on + timedelta(hours=1), POWER_W)
+    assert len(meter.monthly) == MONTHLY_ROLLUP_MONTHS
+    assert next(iter(meter.monthly)) == "2024-03"
+
+
+def test_checkpoint_folds_the_running_interval_once() -> None:
+    meter = EnergyMeter()
+    meter.switched(True, EVENING, POWER_W)
+    meter.checkpoint(EVENING + timedelta(hours=1), POWER_W)
+    assert meter.on_hours == pytest.approx(1.0)
+    assert meter.on_since == EVENING + timedelta(hours=1)
+    assert meter.total_hours(EVENING + timedelta(hours=1.5)) == pytest.approx(1.5)
+    assert meter.total_kwh(EVENING + timedelta(hours=1.5), POWER_W) == pytest.approx(1.5)
+
+    meter.switched(False, EVENING + timedelta(hours=2), POWER_W)
+    assert meter.on_hours == pytest.approx(2.0)
+    assert sum(hours for hours, _kwh in meter.daily.values()) == pytest.approx(2.0)
+
+    # Nothing running: a checkpoint changes nothing.
+    meter.checkpoint(EVENING + timedelta(hours=3), POWER_W)
+    assert meter.on_hours == pytest.approx(2.0)
+    assert meter.on_since is None
+
+
+def test_restore_round_trips_as_dict() -> None:
+    meter = EnergyMeter()
+    meter.switched(True, EVENING, POWER_W)
+    meter.switched(False, EVENING + timedelta(hours=2), 500.0)
+    stored = json.loads(json.dumps(meter.as_dict()))
+
+    restored = EnergyMeter()
+    restored.restore(stored)
+    assert restored.as_dict() == meter.as_dict()
+    restored.daily["2024-01-01"][0] += 1.0
+    assert stored["daily"]["2024-01-01"][0] == pytest.approx(1.5)
+
+    empty = EnergyMeter()
+    empty.restore(None)
+    assert empty.as_dict() == EnergyMeter().as_dict()
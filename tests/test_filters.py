@@ -0,0 +1,134 @@
+"""Tests for input filtering in RoomController."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from custom_components.smartfloorheat.const import (
+    CONF_ECO_SETBACK_C,
+    CONF_MAX_RATE_CPH,
+    CONF_MIN_ON_MINUTES,
+    CONF_STALE_MINUTES,
+    MODE_COMFORT,
+    MODE_ECO,
+)
+from custom_components.smartfloorheat.controllers import RoomController
+from custom_components.smartfloorheat.filters import REJECT_RATE, REJECT_STALE
+
+from .fake_hass import INDOOR, OUTDOOR, SOLAR, Room, room_cfg
+
+
+async def _room(hass) -> RoomController:
+    room = Room(hass, room_cfg(**{CONF_MAX_RATE_CPH: 6.0, CONF_STALE_MINUTES: 120}))
+    await room.set_inputs(indoor=20.0)
+    await room.ctrl.async_added()
+    return room.ctrl
+
+
+def test_step_after_unrelated_updates_is_measured_from_the_last_sample(make_hass) -> None:
+    async def main() -> None:
+        hass = make_hass()
+        ctrl = await _room(hass)
+        for minute in range(10):
+            await hass.clock.advance(timedelta(minutes=1))
+            await hass.states.async_set(SOLAR[0], 1.0 + minute / 10)
+            await ctrl.async_recalculate_and_control()
+        await hass.clock.advance(timedelta(seconds=30))
+        await hass.states.async_set(INDOOR, 20.8)
+        await ctrl.async_recalculate_and_control()
+        assert ctrl.indoor_filter.rejected[REJECT_RATE] == 0
+        assert ctrl.indoor_filter.last[1] == 20.8
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
+
+
+def test_unchanged_reports_keep_an_indoor_sensor_fresh(make_hass) -> None:
+    async def main() -> None:
+        hass = make_hass()
+        ctrl = await _room(hass)
+        for _ in range(15):
+            await hass.clock.advance(timedelta(minutes=10))
+            for entity_id in (INDOOR, OUTDOOR):
+                await hass.states.async_set(entity_id, hass.states.get(entity_id).state)
+            await ctrl.async_recalculate_and_control()
+        assert ctrl.indoor_temp == 20.0
+        assert ctrl.debug["indoor_temp"] == 20.0
+        assert ctrl.indoor_filter.rejected[REJECT_STALE] == 0
+        assert ctrl.outdoor_filter.rejected[REJECT_STALE] == 0
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
+
+
+def test_repeated_reads_of_one_report_are_filtered_once(make_hass) -> None:
+    async def main() -> None:
+        hass = make_hass()
+        ctrl = await _room(hass)
+        await ctrl.async_recalculate_and_control()
+        await hass.clock.advance(timedelta(minutes=150))
+        await hass.states.async_set(INDOOR, 20.0)
+        for _ in range(20):
+            await hass.clock.advance(timedelta(minutes=1))
+            await ctrl.async_recalculate_and_control()
+        assert ctrl.outdoor_filter.rejected[REJECT_STALE] == 1
+        assert len(ctrl.indoor_filter._window) == 2
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
+
+
+def test_rejected_reading_controls_on_the_last_accepted_sample(make_hass) -> None:
+    async def main() -> None:
+        hass = make_hass()
+        room = Room(hass, room_cfg(**{CONF_MAX_RATE_CPH: 6.0, CONF_ECO_SETBACK_C: 2.0}))
+        ctrl = room.ctrl
+        ctrl.async_set_mode(MODE_ECO)
+        await room.set_inputs(indoor=19.5)
+        await ctrl.async_added()
+        await ctrl.async_recalculate_and_control()
+        assert not ctrl.is_heating
+
+        # Back to comfort while the sensor glitches: 19.5 °C still needs heat.
+        ctrl.async_set_mode(MODE_COMFORT)
+        await hass.clock.advance(timedelta(minutes=1))
+        await hass.states.async_set(INDOOR, 30.0)
+        await ctrl.async_recalculate_and_control()
+        assert ctrl.indoor_filter.rejected[REJECT_RATE] == 1
+        assert ctrl.is_heating
+        assert ctrl.debug["indoor_temp"] == 19.5
+        assert len(ctrl.indoor_samples) == 1
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
+
+
+def test_stale_indoor_turns_the_heater_off_after_min_on(make_hass) -> None:
+    async def main() -> None:
+        hass = make_hass()
+        room = Room(hass, room_cfg(**{CONF_STALE_MINUTES: 10, CONF_MIN_ON_MINUTES: 30}))
+        ctrl = room.ctrl
+        await room.set_inputs(indoor=17.0)
+        await ctrl.async_added()
+        await ctrl.async_recalculate_and_control()
+        assert ctrl.is_heating
+
+        await hass.clock.advance(timedelta(minutes=20))
+        await ctrl.async_recalculate_and_control()
+        assert ctrl.indoor_stale
+        assert ctrl.extra_attrs["indoor_stale"]
+        assert ctrl.debug["indoor_temp"] is None
+        assert ctrl.is_heating
+
+        await hass.clock.advance(timedelta(minutes=15))
+        await ctrl.async_recalculate_and_control()
+        assert not ctrl.is_heating
+
+        await hass.states.async_set(INDOOR, 17.1)
+        await ctrl.async_recalculate_and_control()
+        assert not ctrl.indoor_stale
+        assert ctrl.is_heating
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
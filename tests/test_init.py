@@ -0,0 +1,38 @@
+"""Tests for routing service calls to rooms across config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from custom_components.smartfloorheat import _register_rooms, async_unload_entry
+from custom_components.smartfloorheat.const import DATA_ROOMS, DOMAIN
+from custom_components.smartfloorheat.coordinator import SmartFloorHeatCoordinator
+
+from .fake_hass import room_cfg
+
+
+def test_unloading_an_entry_hands_a_shared_room_id_to_the_other(make_hass) -> None:
+    async def main() -> None:
+        hass = make_hass()
+
+        async def unload_platforms(_entry, _platforms) -> bool:
+            return True
+
+        hass.config_entries = SimpleNamespace(async_unload_platforms=unload_platforms)
+        entries = [SimpleNamespace(entry_id=f"entry_{i}", title=f"Entry {i}") for i in range(2)]
+        coordinators = [SmartFloorHeatCoordinator(hass, [room_cfg()], entry.entry_id) for entry in entries]
+        for entry, coordinator in zip(entries, coordinators):
+            hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+            _register_rooms(hass, entry, coordinator)
+
+        first, second = coordinators
+        assert hass.data[DATA_ROOMS]["test"] == (first, first.controllers["test"])
+
+        assert await async_unload_entry(hass, entries[0])
+        assert hass.data[DATA_ROOMS]["test"] == (second, second.controllers["test"])
+
+        assert await async_unload_entry(hass, entries[1])
+        assert hass.data[DATA_ROOMS] == {}
+
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+"""Tests for the recalculation fingerprint in RoomController."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from .fake_hass import SOLAR, Room, room_cfg
+
+
+def test_unchanged_inputs_hit_the_memo_and_match_a_full_recalculation(make_hass) -> None:
+    async def main() -> None:
+        room = Room(make_hass(), room_cfg())
+        ctrl = room.ctrl
+        await room.set_inputs()
+        await ctrl.async_added()
+        await ctrl.async_recalculate_and_control()
+        assert (ctrl.memo_hits, ctrl.memo_misses) == (0, 1)
+
+        for _ in range(5):
+            await room.hass.clock.advance(timedelta(minutes=1))
+            # Re-report identical values, as a sensor echo would.
+            await room.set_inputs()
+            await ctrl.async_recalculate_and_control()
+        assert ctrl.memo_hits == 5
+        cached = ctrl.computed_final_setpoint
+
+        ctrl._fingerprint = None
+        await ctrl.async_recalculate_and_control()
+        assert ctrl.computed_final_setpoint == cached
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
+
+
+def test_changed_input_misses_the_memo(make_hass) -> None:
+    async def main() -> None:
+        room = Room(make_hass(), room_cfg())
+        ctrl = room.ctrl
+        await room.set_inputs()
+        await ctrl.async_added()
+        await ctrl.async_recalculate_and_control()
+        await room.hass.clock.advance(timedelta(minutes=1))
+        await room.hass.states.async_set(SOLAR[0], 2.0)
+        await ctrl.async_recalculate_and_control()
+        assert (ctrl.memo_hits, ctrl.memo_misses) == (0, 2)
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
@@ -0,0 +1,26 @@
+"""Tests for weekly schedule parsing."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from custom_components.smartfloorheat.const import MODE_COMFORT, MODE_ECO
+from custom_components.smartfloorheat.schedule import WeeklySchedule
+
+# 2024-01-01 is a Monday.
+MONDAY = datetime(2024, 1, 1)
+
+
+def test_day_range_wraps_over_the_end_of_the_week() -> None:
+    schedule = WeeklySchedule.parse("sat-mon 06:00 comfort; tue-fri 06:00 eco")
+    assert schedule.mode_at(MONDAY.replace(hour=7)) == MODE_COMFORT
+    assert schedule.mode_at(MONDAY.replace(day=3, hour=7)) == MODE_ECO
+    assert schedule.mode_at(MONDAY.replace(day=6, hour=7)) == MODE_COMFORT
+    assert schedule.mode_at(MONDAY.replace(day=7, hour=7)) == MODE_COMFORT
+
+
+def test_schedule_without_transitions_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        WeeklySchedule.parse(";;")
@@ -0,0 +1,136 @@
+"""Tests for how RoomController hands switches to the coordinator."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from custom_components.smartfloorheat.const import (
+    CONF_FLOOR_MAX_C,
+    CONF_FLOOR_TEMP_SENSOR,
+    CONF_OUTPUT_MODE,
+    CONF_PWM_PERIOD_MINUTES,
+    FLOOR_LIMIT_MAX,
+    OUTPUT_PWM,
+)
+from custom_components.smartfloorheat.controllers import RoomController
+
+from .fake_hass import START, Room, room_cfg
+
+FLOOR = "sensor.floor"
+
+
+def _cold_room(hass, switch_callback, **overrides) -> Room:
+    cfg = room_cfg(**{CONF_FLOOR_TEMP_SENSOR: FLOOR, CONF_FLOOR_MAX_C: 27.0, **overrides})
+    return Room(hass, cfg, switch_callback)
+
+
+def test_queued_switch_is_not_committed_until_confirmed(make_hass) -> None:
+    requests: list[bool] = []
+
+    async def queue(_ctrl: RoomController, turn_on: bool) -> None:
+        requests.append(turn_on)
+
+    async def main() -> None:
+        room = _cold_room(make_hass(), queue)
+        ctrl = room.ctrl
+        await room.set_inputs(indoor=17.0)
+        await ctrl.async_added()
+        await ctrl.async_recalculate_and_control()
+        assert requests == [True]
+        assert not ctrl.is_heating
+        assert ctrl.last_switch_change_ts is None
+
+        # Still queued: not requested a second time.
+        ctrl._fingerprint = None
+        await ctrl.async_recalculate_and_control()
+        assert requests == [True]
+
+        ctrl.confirm_switch(True)
+        assert ctrl.is_heating
+        assert ctrl.energy.on_since is not None
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
+
+
+def test_abandoned_switch_is_retried(make_hass) -> None:
+    requests: list[bool] = []
+
+    async def fail(ctrl: RoomController, turn_on: bool) -> None:
+        requests.append(turn_on)
+        ctrl.abandon_switch()
+
+    async def main() -> None:
+        room = _cold_room(make_hass(), fail)
+        ctrl = room.ctrl
+        await room.set_inputs(indoor=17.0)
+        await ctrl.async_added()
+        await ctrl.async_recalculate_and_control()
+        await ctrl.async_recalculate_and_control()
+        assert requests == [True, True]
+        assert not ctrl.is_heating
+        assert ctrl.energy.on_since is None
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
+
+
+def test_floor_limit_holds_until_the_floor_has_cooled_by_the_margin(make_hass) -> None:
+    updates: list[None] = []
+
+    async def switch(ctrl: RoomController, turn_on: bool) -> None:
+        ctrl.confirm_switch(turn_on)
+
+    async def main() -> None:
+        hass = make_hass()
+        room = _cold_room(hass, switch)
+        ctrl = room.ctrl
+        ctrl.update_callback = lambda: updates.append(None)
+        await hass.states.async_set(FLOOR, 25.0)
+        await room.set_inputs(indoor=17.0)
+        await ctrl.async_added()
+        await ctrl.async_recalculate_and_control()
+        assert ctrl.is_heating
+
+        await hass.states.async_set(FLOOR, 27.0)
+        assert ctrl.floor_limit == FLOOR_LIMIT_MAX
+        assert not ctrl.is_heating
+        assert len(updates) == 1
+        await hass.states.async_set(FLOOR, 26.8)
+        assert ctrl.floor_limit == FLOOR_LIMIT_MAX
+        assert not ctrl.is_heating
+        await hass.states.async_set(FLOOR, 26.4)
+        assert ctrl.floor_limit is None
+        assert ctrl.is_heating
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
+
+
+def test_pwm_phase_change_applies_from_the_next_period(make_hass) -> None:
+    edges: list[tuple[float, bool]] = []
+
+    async def main() -> None:
+        hass = make_hass()
+
+        async def switch(ctrl: RoomController, turn_on: bool) -> None:
+            edges.append(((hass.clock.now - START).total_seconds() / 60, turn_on))
+            ctrl.confirm_switch(turn_on)
+
+        ctrl = _cold_room(hass, switch, **{CONF_OUTPUT_MODE: OUTPUT_PWM, CONF_PWM_PERIOD_MINUTES: 30}).ctrl
+        ctrl.duty_cycle = 0.5
+        await ctrl.async_added()
+        await hass.clock.advance(timedelta(minutes=10))
+        # The planner moves the room half a period mid-window.
+        ctrl.pwm_phase = 0.5
+        await hass.clock.advance(timedelta(minutes=110))
+        await ctrl.async_will_remove()
+
+    asyncio.run(main())
+    assert edges == [
+        (0, True), (15, False),
+        (30, True), (45, False),
+        (75, True), (90, False),
+        (105, True), (120, False),
+    ]
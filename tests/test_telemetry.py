@@ -0,0 +1,46 @@
+"""Tests for the telemetry exporter."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import json
+
+from custom_components.smartfloorheat import telemetry
+from custom_components.smartfloorheat.const import TELEMETRY_JSONL, TELEMETRY_LINE_PROTOCOL
+from custom_components.smartfloorheat.telemetry import TelemetryExporter, format_line_protocol
+
+from .fake_hass import FakeHass
+
+TS = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_line_protocol_escapes_and_skips_missing_fields() -> None:
+    line = format_line_protocol(
+        TS, "living room", {"final_setpoint": 21.5, "mode": 'e"co', "heating_request": True, "outdoor_temp": None}
+    )
+    assert line == (
+        'smartfloorheat,room=living\\ room final_setpoint=21.5,mode="e\\"co",heating_request=true '
+        f"{int(TS.timestamp() * 1e9)}"
+    )
+    assert format_line_protocol(TS, "room", {"outdoor_temp": None}) is None
+
+
+def test_full_buffer_evicts_oldest_and_counts_drops(monkeypatch) -> None:
+    monkeypatch.setattr(telemetry, "BUFFER_RECORDS", 3)
+    monkeypatch.setattr(telemetry, "FLUSH_BATCH_RECORDS", 100)
+    exporter = TelemetryExporter(FakeHass(), TELEMETRY_JSONL, "unused", 1024)
+    for index in range(5):
+        exporter.record(TS, "room", {"index": index})
+    assert exporter.dropped == 2
+    assert [json.loads(line)["index"] for line in exporter.buffer] == [2, 3, 4]
+
+
+def test_file_target_rotates_by_size(tmp_path) -> None:
+    target = tmp_path / "telemetry.lp"
+    exporter = TelemetryExporter(FakeHass(), TELEMETRY_LINE_PROTOCOL, str(target), 64)
+    for index in range(4):
+        exporter._write([f"smartfloorheat,room=r value={index}.0 {index}" * 2])
+    assert target.exists()
+    assert (tmp_path / "telemetry.lp.1").exists()
+    assert (tmp_path / "telemetry.lp.3").exists()
+    assert not (tmp_path / "telemetry.lp.4").exists()
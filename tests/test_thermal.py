@@ -0,0 +1,72 @@
+"""Tests for the coupled multi-room thermal model."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from custom_components.smartfloorheat.thermal import MIN_UPDATES, ThermalModel
+
+ROOMS = ["hall", "kitchen", "living", "bedroom"]
+ADJACENCY = {"hall": ["kitchen"], "kitchen": ["living"], "living": ["bedroom"]}
+LOSS = np.array([0.04, 0.06, 0.05, 0.03])
+COUPLING = 0.1
+HEATING = np.array([0.8, 0.6, 0.9, 0.7])
+DT_H = 0.25
+
+
+def _simulate(model: ThermalModel, steps: int, seed: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    """Drive a chain of rooms with the model's own equations and random heating."""
+    rng = np.random.default_rng(seed)
+    temps = np.array([19.0, 21.0, 20.0, 18.0])
+    outdoor = np.full(len(ROOMS), 2.0)
+    model.observe(temps, outdoor, np.zeros(len(ROOMS)), DT_H)
+    for _ in range(steps):
+        duty = rng.uniform(0.0, 1.0, len(ROOMS))
+        flow = np.zeros(len(ROOMS))
+        flow[:-1] += COUPLING * (temps[1:] - temps[:-1])
+        flow[1:] += COUPLING * (temps[:-1] - temps[1:])
+        temps = temps + DT_H * (LOSS * (outdoor - temps) + flow + HEATING * duty)
+        model.observe(temps, outdoor, duty, DT_H)
+    return temps, outdoor
+
+
+def test_identifies_chain_parameters() -> None:
+    model = ThermalModel(ROOMS, ADJACENCY)
+    _simulate(model, 400)
+    for i, room_id in enumerate(ROOMS):
+        params = model.params(i)
+        assert params["tau_h"] is not None
+        assert abs(1 / params["tau_h"] - LOSS[i]) < 1e-3, room_id
+        assert abs(params["heating_cph"] - HEATING[i]) < 1e-2, room_id
+        degree = 1 if i in (0, len(ROOMS) - 1) else 2
+        assert abs(params["coupling_per_h"] - COUPLING * degree) < 1e-2, room_id
+
+
+def test_predictions_wait_for_enough_updates() -> None:
+    model = ThermalModel(ROOMS, ADJACENCY)
+    temps, outdoor = _simulate(model, MIN_UPDATES - 1)
+    duty = np.zeros(len(ROOMS))
+    assert np.isnan(model.predict(temps, outdoor, duty, DT_H)).all()
+
+    temps, outdoor = _simulate(model, 1)
+    assert not np.isnan(model.predict(temps, outdoor, duty, DT_H)).any()
+
+
+def test_missing_reading_skips_the_room() -> None:
+    model = ThermalModel(ROOMS, ADJACENCY)
+    temps, outdoor = _simulate(model, 40)
+    temps[2] = np.nan
+    predicted = model.predict(temps, outdoor, np.ones(len(ROOMS)), DT_H)
+    assert np.isnan(predicted[2])
+    assert not np.isnan(predicted[[0, 1, 3]]).any()
+
+
+def test_rooms_without_neighbours_get_no_prediction() -> None:
+    model = ThermalModel([*ROOMS, "garage"], ADJACENCY)
+    temps = np.array([19.0, 21.0, 20.0, 18.0, 10.0])
+    outdoor = np.full(len(temps), 2.0)
+    for _ in range(MIN_UPDATES + 1):
+        model.observe(temps, outdoor, np.zeros(len(temps)), DT_H)
+    predicted = model.predict(temps, outdoor, np.zeros(len(temps)), DT_H)
+    assert not np.isnan(predicted[:-1]).any()
+    assert np.isnan(predicted[-1])